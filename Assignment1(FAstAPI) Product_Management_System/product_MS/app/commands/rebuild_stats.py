@@ -0,0 +1,38 @@
+"""
+Verify (and by default rebuild) the product_stats summary table against a
+full GROUP BY over products, and the row_counts table against COUNT(*).
+
+    python -m app.commands.rebuild_stats            # report mismatches, then rebuild
+    python -m app.commands.rebuild_stats --check    # report only, exit 1 on mismatch
+"""
+import argparse
+import json
+import sys
+from app.config.database import SessionLocal, engine, Base
+from app.config.schema import ensure_schema
+from app.utils.stats import diff_product_stats, rebuild_product_stats
+from app.utils.counts import diff_row_counts, rebuild_row_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only compare, do not rewrite the table")
+    args = parser.parse_args()
+
+    import app.models  # noqa: F401  (register every table before the schema check)
+    ensure_schema(engine, Base.metadata)
+    with SessionLocal() as db:
+        mismatches = diff_product_stats(db)
+        count_mismatches = diff_row_counts(db)
+        report = {"mismatches": len(mismatches), "groups": mismatches[:50], "row_counts": count_mismatches}
+        if not args.check:
+            report["rebuilt_groups"] = rebuild_product_stats(db)
+            report["rebuilt_row_counts"] = rebuild_row_counts(db)
+            db.commit()
+    print(json.dumps(report, indent=2, default=str))
+    if args.check and (mismatches or count_mismatches):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
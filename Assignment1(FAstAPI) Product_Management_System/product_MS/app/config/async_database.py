@@ -0,0 +1,84 @@
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config.database import DATABASE_URL
+from app.config.settings import ASYNC_DATABASE_URL, READ_REPLICA_URLS
+from app.config.pool import engine_pool_kwargs, monitor_pool
+from app.config.replicas import Replica, ReplicaSet, lag_sql, replica_session_info, wrote_recently
+
+# Async drivers for the sync URLs we use
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver for its async counterpart (psycopg 3 is async-capable as is)"""
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql+psycopg":
+        return url
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def build_async_engine(url, name="primary_async"):
+    """Create an async engine with the shared pool profile and watch its pool"""
+    monitor = monitor_pool(name)
+    engine = create_async_engine(url, poolclass=monitor.pool_class(AsyncAdaptedQueuePool), **engine_pool_kwargs())
+    monitor.attach(engine.sync_engine)
+    return engine
+
+# Create async SQLAlchemy engine
+async_engine = build_async_engine(ASYNC_DATABASE_URL or to_async_url(DATABASE_URL))
+
+# Async session factory (objects stay usable after commit, no lazy refresh needed)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Async read replicas (None when READ_REPLICA_URLS is not set)
+async_replica_set = None
+if READ_REPLICA_URLS:
+    replicas = []
+    for i, url in enumerate(READ_REPLICA_URLS):
+        name = f"replica-{i}"
+        replica_engine = build_async_engine(to_async_url(url), f"{name}_async")
+        factory = async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False, info=replica_session_info(name))
+        replicas.append(Replica(name, replica_engine, factory))
+    async_replica_set = ReplicaSet(replicas)
+
+
+async def get_async_db():
+    """
+    Async database session dependency
+    Har request ke liye new session create hoga
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def check_async_replica(replica):
+    """Measure one replica's lag (or record why it is unreachable)"""
+    try:
+        async with replica.engine.connect() as conn:
+            lag = (await conn.execute(text(lag_sql(replica.engine.dialect.name)))).scalar()
+        async_replica_set.record(replica, lag=lag)
+    except Exception as e:
+        async_replica_set.record(replica, error=e)
+
+
+async def get_async_read_db(request: Request):
+    """
+    Async read-only session dependency for GET handlers
+    Replicas round-robin, primary if none is healthy or the client just wrote
+    """
+    factory = AsyncSessionLocal
+    if async_replica_set is not None and not wrote_recently(request):
+        for replica in async_replica_set.due_for_check():
+            await check_async_replica(replica)
+        replica = async_replica_set.pick()
+        if replica is not None:
+            factory = replica.session_factory
+    async with factory() as db:
+        yield db
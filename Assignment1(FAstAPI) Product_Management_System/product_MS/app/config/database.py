@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
+from app.config.settings import SQL_ECHO, READ_REPLICA_URLS
+from app.config.pool import engine_pool_kwargs, monitor_pool
+from app.config.replicas import Replica, ReplicaSet, lag_sql, replica_session_info, wrote_recently
 import os
 
 # Load environment variables
@@ -10,16 +15,35 @@ load_dotenv()
 # Database URL from .env
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+def build_engine(url, name="primary"):
+    """Create a SQLAlchemy engine with the shared pool profile and watch its pool"""
+    monitor = monitor_pool(name)
+    engine = create_engine(
+        url,
+        poolclass=monitor.pool_class(QueuePool),
+        **engine_pool_kwargs(),  # DB_POOL_PROFILE + DB_POOL_* overrides
+        echo=SQL_ECHO  # SQL_ECHO=true pe SQL queries print honge (debugging ke liye)
+    )
+    monitor.attach(engine)
+    return engine
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Connection health check
-    echo=True  # SQL queries print honge (debugging ke liye)
-)
+engine = build_engine(DATABASE_URL)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas (None when READ_REPLICA_URLS is not set)
+replica_set = None
+if READ_REPLICA_URLS:
+    replicas = []
+    for i, url in enumerate(READ_REPLICA_URLS):
+        name = f"replica-{i}"
+        replica_engine = build_engine(url, name)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine, info=replica_session_info(name))
+        replicas.append(Replica(name, replica_engine, factory))
+    replica_set = ReplicaSet(replicas)
+
 # Base class for models
 Base = declarative_base()
 
@@ -34,3 +58,29 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def check_replica(replica):
+    """Measure one replica's lag (or record why it is unreachable)"""
+    try:
+        with replica.engine.connect() as conn:
+            replica_set.record(replica, lag=conn.execute(text(lag_sql(replica.engine.dialect.name))).scalar())
+    except Exception as e:
+        replica_set.record(replica, error=e)
+
+def get_read_db(request: Request):
+    """
+    Read-only session dependency for GET handlers
+    Replicas round-robin, primary if none is healthy or the client just wrote
+    """
+    factory = SessionLocal
+    if replica_set is not None and not wrote_recently(request):
+        for replica in replica_set.due_for_check():
+            check_replica(replica)
+        replica = replica_set.pick()
+        if replica is not None:
+            factory = replica.session_factory
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
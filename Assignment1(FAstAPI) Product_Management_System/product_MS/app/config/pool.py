@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import event, exc
+from app.config import settings
+from app.utils.metrics import db_pool_checkout_wait
+
+# Presets per deployment shape; individual DB_POOL_* settings override them
+POOL_PROFILES = {
+    # SQLAlchemy defaults, ping on every checkout (the original behaviour)
+    "default": {"pool_size": 5, "max_overflow": 10, "pool_recycle": -1, "pool_timeout": 30.0,
+                "pre_ping": "always", "pre_ping_idle_seconds": 30.0},
+    # Many concurrent requests per worker: bigger pool, fail fast, ping only idle connections
+    "web": {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800, "pool_timeout": 10.0,
+            "pre_ping": "idle", "pre_ping_idle_seconds": 30.0},
+    # Background/batch workers: few long-lived connections, no overflow churn
+    "worker": {"pool_size": 2, "max_overflow": 0, "pool_recycle": 3600, "pool_timeout": 60.0,
+               "pre_ping": "idle", "pre_ping_idle_seconds": 60.0},
+}
+
+PRE_PING_MODES = ("always", "idle", "never")
+
+# Recent checkout waits kept per pool for percentiles
+WAIT_SAMPLES = 2048
+
+
+def resolve_pool_config() -> dict:
+    """Profile preset with the explicit settings applied on top"""
+    if settings.DB_POOL_PROFILE not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE '{settings.DB_POOL_PROFILE}', use one of {list(POOL_PROFILES)}")
+    config = dict(POOL_PROFILES[settings.DB_POOL_PROFILE], profile=settings.DB_POOL_PROFILE)
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pre_ping": settings.DB_PRE_PING,
+        "pre_ping_idle_seconds": settings.DB_PRE_PING_IDLE_SECONDS,
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    if config["pre_ping"] not in PRE_PING_MODES:
+        raise ValueError(f"Unknown DB_PRE_PING '{config['pre_ping']}', use one of {list(PRE_PING_MODES)}")
+    return config
+
+
+POOL_CONFIG = resolve_pool_config()
+
+
+def engine_pool_kwargs() -> dict:
+    """Keyword arguments for create_engine / create_async_engine"""
+    return {
+        "pool_size": POOL_CONFIG["pool_size"],
+        "max_overflow": POOL_CONFIG["max_overflow"],
+        "pool_recycle": POOL_CONFIG["pool_recycle"],
+        "pool_timeout": POOL_CONFIG["pool_timeout"],
+        "pool_pre_ping": POOL_CONFIG["pre_ping"] == "always",
+    }
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+
+class PoolMonitor:
+    """
+    Tracks one engine's pool: checkout waits, connection ages and the
+    idle-only pre-ping. Waits are timed by the pool class from pool_class()
+    (Pool.connect() is what the engine calls for every checkout), everything
+    else through the public pool events. Both survive engine.dispose(), which
+    recreates the pool with the same class and event listeners.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self.created = {}            # connection record id -> connect time
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        # The engine's current pool (a new one after dispose())
+        return self.engine.pool
+
+    def record_wait(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.waits.append(waited)
+            if timed_out:
+                self.timeouts += 1
+        db_pool_checkout_wait.observe(waited, (self.name,))
+
+    def pool_class(self, base):
+        """Subclass of `base` (poolclass= for create_engine) that times every checkout"""
+        monitor = self
+
+        class TimedPool(base):
+            def connect(self):
+                started = time.perf_counter()
+                timed_out = False
+                try:
+                    return super().connect()
+                except exc.TimeoutError:
+                    timed_out = True
+                    raise
+                finally:
+                    monitor.record_wait(time.perf_counter() - started, timed_out)
+
+        TimedPool.__name__ = TimedPool.__qualname__ = base.__name__
+        return TimedPool
+
+    def attach(self, sync_engine):
+        """Listen to the engine's pool events (registered on the engine, kept across dispose())"""
+        self.engine = sync_engine
+        idle_ping = POOL_CONFIG["pre_ping"] == "idle"
+        idle_seconds = POOL_CONFIG["pre_ping_idle_seconds"]
+
+        @event.listens_for(sync_engine, "connect")
+        def _connect(dbapi_connection, record):
+            with self._lock:
+                self.created[id(record)] = time.monotonic()
+            record.info["last_checkin"] = time.monotonic()
+
+        @event.listens_for(sync_engine, "close")
+        def _close(dbapi_connection, record):
+            with self._lock:
+                self.created.pop(id(record), None)
+
+        @event.listens_for(sync_engine, "checkin")
+        def _checkin(dbapi_connection, record):
+            if record is not None:
+                record.info["last_checkin"] = time.monotonic()
+
+        @event.listens_for(sync_engine, "checkout")
+        def _checkout(dbapi_connection, record, proxy):
+            with self._lock:
+                self.checkouts += 1
+            if not idle_ping:
+                return
+            idle = time.monotonic() - record.info.get("last_checkin", 0.0)
+            if idle < idle_seconds:
+                return
+            with self._lock:
+                self.pings += 1
+            try:
+                alive = self.engine.dialect.do_ping(dbapi_connection)
+            except Exception:
+                alive = False
+            if not alive:
+                with self._lock:
+                    self.ping_failures += 1
+                # Pool discards this connection and retries with a fresh one
+                raise exc.DisconnectionError("Connection failed idle pre-ping")
+
+    def stats(self) -> dict:
+        pool = self.pool
+        now = time.monotonic()
+        with self._lock:
+            ages = sorted(now - created for created in self.created.values())
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "idle_pings": self.pings,
+                "idle_ping_failures": self.ping_failures,
+            }
+        waits = sorted(self.waits)
+
+        def ms(value):
+            return round(value * 1000, 3) if value is not None else None
+
+        occupancy = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "max_overflow": POOL_CONFIG["max_overflow"],
+        }
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__,
+            "occupancy": occupancy,
+            "checkout_wait_ms": {
+                "samples": len(waits),
+                "p50": ms(_percentile(waits, 50)),
+                "p95": ms(_percentile(waits, 95)),
+                "p99": ms(_percentile(waits, 99)),
+                "max": ms(waits[-1] if waits else None),
+            },
+            "connection_age_seconds": {
+                "open": len(ages),
+                "min": round(ages[0], 1) if ages else None,
+                "avg": round(sum(ages) / len(ages), 1) if ages else None,
+                "max": round(ages[-1], 1) if ages else None,
+            },
+            **counters,
+        }
+
+
+# All monitored pools (primary, replicas, async engines)
+pool_monitors = []
+
+
+def monitor_pool(name: str) -> PoolMonitor:
+    """
+    Register a monitor; pass monitor.pool_class(...) as the engine's poolclass,
+    then call monitor.attach(engine) (engine.sync_engine for async engines)
+    """
+    monitor = PoolMonitor(name)
+    pool_monitors.append(monitor)
+    return monitor
+
+
+def pool_report() -> dict:
+    config = {key: value for key, value in POOL_CONFIG.items()}
+    return {"config": config, "pools": [monitor.stats() for monitor in pool_monitors]}
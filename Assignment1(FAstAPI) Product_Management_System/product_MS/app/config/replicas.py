@@ -0,0 +1,122 @@
+import itertools
+import threading
+import time
+from fastapi import Request
+from app.config.settings import REPLICA_MAX_LAG_SECONDS, REPLICA_CHECK_INTERVAL_SECONDS, READ_YOUR_WRITES_SECONDS
+
+# Cookie set on successful writes; while present, reads go to the primary
+STICKY_COOKIE = "pms_wrote_at"
+
+# Session.info key naming the replica a session reads from (absent on the primary)
+REPLICA_INFO_KEY = "replica"
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received
+POSTGRES_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def lag_sql(dialect: str) -> str:
+    """Lag query for a dialect; other databases only get a reachability check"""
+    return POSTGRES_LAG_SQL if dialect == "postgresql" else "SELECT 0"
+
+
+class Replica:
+    def __init__(self, name: str, engine, session_factory):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.lag = None
+        self.healthy = True
+        self.error = None
+        self.checked_at = 0.0
+
+
+class ReplicaSet:
+    """
+    Round-robin selection over replicas that are reachable and within
+    REPLICA_MAX_LAG_SECONDS. Health is re-checked lazily, at most once per
+    REPLICA_CHECK_INTERVAL_SECONDS per replica, by whichever request is first.
+    """
+
+    def __init__(self, replicas, max_lag=REPLICA_MAX_LAG_SECONDS, check_interval=REPLICA_CHECK_INTERVAL_SECONDS):
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def due_for_check(self):
+        """Replicas whose status is stale; claims them so only one request checks each"""
+        now = time.monotonic()
+        with self._lock:
+            due = [r for r in self.replicas if now - r.checked_at >= self.check_interval]
+            for replica in due:
+                replica.checked_at = now
+            return due
+
+    def record(self, replica: Replica, lag=None, error=None):
+        replica.lag = float(lag) if lag is not None else None
+        replica.error = str(error) if error is not None else None
+        replica.healthy = error is None and replica.lag is not None and replica.lag <= self.max_lag
+
+    def pick(self):
+        """Next healthy replica, or None to fall back to the primary"""
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def status(self):
+        return [
+            {"name": r.name, "healthy": r.healthy, "lag_seconds": r.lag, "error": r.error}
+            for r in self.replicas
+        ]
+
+
+def replica_session_info(name: str) -> dict:
+    """Session.info for a replica's sessionmaker"""
+    return {REPLICA_INFO_KEY: name}
+
+
+def served_by_replica(session) -> bool:
+    """True if the (sync or async) session reads from a replica, which may lag"""
+    return bool(session.info.get(REPLICA_INFO_KEY))
+
+
+def wrote_recently(request: Request) -> bool:
+    """True while the client's read-your-writes window is open"""
+    wrote_at = request.cookies.get(STICKY_COOKIE)
+    if not wrote_at:
+        return False
+    try:
+        return time.time() - float(wrote_at) < READ_YOUR_WRITES_SECONDS
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients after a successful write so their next reads hit the primary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        async def marking_send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{STICKY_COOKIE}={time.time():.3f}; Max-Age={int(READ_YOUR_WRITES_SECONDS) or 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": list(message["headers"]) + [(b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, marking_send)
@@ -0,0 +1,78 @@
+"""
+Startup schema check.
+
+create_all() reflects every table on every start, in every worker. Instead we
+hash the DDL the models would emit and keep that hash in a one-row table:
+a matching hash costs one query, and create_all only runs when the models
+changed (or on a fresh database). On PostgreSQL an advisory lock makes
+concurrently starting workers wait for the first one instead of racing it.
+"""
+import hashlib
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, insert, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.utils.search import SEARCH_COLUMNS, ensure_search_index
+
+# Kept out of the models' metadata so it never feeds its own fingerprint
+_fingerprint_metadata = MetaData()
+schema_fingerprint_table = Table(
+    "schema_fingerprint",
+    _fingerprint_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+# pg_advisory_xact_lock key shared by all workers
+SCHEMA_LOCK_KEY = 7310425
+
+
+def schema_fingerprint(metadata: MetaData, dialect) -> str:
+    """Hash of the CREATE TABLE / CREATE INDEX statements for this dialect"""
+    digest = hashlib.blake2b(digest_size=16)
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda ix: ix.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    # The search index DDL lives in app.utils.search, not in the models
+    digest.update(",".join(SEARCH_COLUMNS).encode())
+    return digest.hexdigest()
+
+
+def _stored_fingerprint(conn):
+    if not inspect(conn).has_table(schema_fingerprint_table.name):
+        return None
+    return conn.execute(select(schema_fingerprint_table.c.fingerprint)).scalar()
+
+
+def ensure_schema(engine: Engine, metadata: MetaData, mode: str = "fingerprint") -> dict:
+    """
+    Make sure the tables exist. mode: "fingerprint", "create_all" or "off".
+    Returns {"mode", "fingerprint", "changed"}.
+    """
+    if mode == "off":
+        ensure_search_index(engine)
+        return {"mode": mode, "fingerprint": None, "changed": False}
+
+    fingerprint = schema_fingerprint(metadata, engine.dialect)
+    changed = True
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        if mode == "fingerprint" and _stored_fingerprint(conn) == fingerprint:
+            changed = False
+        else:
+            metadata.create_all(conn)
+            # create_all skips tables that already exist, including their new indexes
+            for table in metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            _fingerprint_metadata.create_all(conn)
+            conn.execute(delete(schema_fingerprint_table))
+            conn.execute(insert(schema_fingerprint_table).values(
+                id=1, fingerprint=fingerprint, applied_at=datetime.now(timezone.utc)
+            ))
+    # Idempotent and a single catalog lookup when the index already exists
+    ensure_search_index(engine)
+    return {"mode": mode, "fingerprint": fingerprint, "changed": changed}
@@ -0,0 +1,84 @@
+from dotenv import load_dotenv
+import os
+
+# Load environment variables
+load_dotenv()
+
+# "sync" -> blocking Session + def handlers (default)
+# "async" -> AsyncSession + async def handlers (needs asyncpg / aiosqlite)
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+# Optional explicit URL for the async engine, otherwise derived from DATABASE_URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+def _optional(name, cast):
+    value = os.getenv(name)
+    return cast(value) if value not in (None, "") else None
+
+# Connection pool profile shared by all engines: "default", "web" or "worker"
+# (presets in app/config/pool.py); the DB_POOL_* / DB_PRE_PING* variables
+# below override single values of the chosen profile
+DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "default").lower()
+DB_POOL_SIZE = _optional("DB_POOL_SIZE", int)
+DB_MAX_OVERFLOW = _optional("DB_MAX_OVERFLOW", int)
+DB_POOL_RECYCLE = _optional("DB_POOL_RECYCLE", int)       # seconds, -1 = never recycle
+DB_POOL_TIMEOUT = _optional("DB_POOL_TIMEOUT", float)     # seconds to wait for a free connection
+# Pre-ping: "always" (every checkout), "idle" (only after the connection sat
+# unused for DB_PRE_PING_IDLE_SECONDS) or "never"
+DB_PRE_PING = _optional("DB_PRE_PING", str.lower)
+DB_PRE_PING_IDLE_SECONDS = _optional("DB_PRE_PING_IDLE_SECONDS", float)
+
+# In-process cache for GET-by-id lookups (0 entries disables it)
+ENTITY_CACHE_MAX_ENTRIES = int(os.getenv("ENTITY_CACHE_MAX_ENTRIES", "10000"))
+ENTITY_CACHE_TTL_SECONDS = float(os.getenv("ENTITY_CACHE_TTL_SECONDS", "60"))
+
+# GET-by-id cache misses arriving within this window (ms) share one IN query
+# (0 = only share queries already in flight for the same id)
+COALESCE_WINDOW_MS = float(os.getenv("COALESCE_WINDOW_MS", "1"))
+# Most ids one coalesced query fetches
+COALESCE_MAX_BATCH = int(os.getenv("COALESCE_MAX_BATCH", "100"))
+# Most ids accepted by the ?ids= multi-get on the list endpoints
+MULTI_GET_MAX_IDS = int(os.getenv("MULTI_GET_MAX_IDS", "100"))
+
+# Largest `limit` accepted by the list and search endpoints
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+# ?count= on list/search: filtered totals are cached per query for this long
+# (writes made by this process drop them right away; 0 entries disables it)
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1000"))
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+# ?count=estimate: planner estimates at or above this are returned as-is,
+# smaller results are counted exactly (PostgreSQL only; elsewhere always exact)
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+# List endpoints render JSON straight from pydantic-core (same bytes, less CPU)
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Print every SQL statement (debugging only, costs throughput)
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+# Statements slower than this (ms) land in the slow-query log (0 disables it)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# How many slow queries the in-memory ring buffer keeps
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+# Capture an EXPLAIN plan for slow SELECTs (one extra round-trip per slow query)
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+# JSON-lines file the buffer is dumped to (POST /admin/slow-queries/dump, and on shutdown)
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE") or None
+
+# Comma-separated read-replica URLs; GET list/get/search handlers read from these
+READ_REPLICA_URLS = [url.strip() for url in os.getenv("READ_REPLICA_URLS", "").split(",") if url.strip()]
+# Replicas lagging more than this are skipped (reads fall back to the primary)
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# How often each replica's lag/health is re-checked
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+# After a write, the same client reads from the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Startup schema handling: "fingerprint" (run create_all only when the stored
+# model fingerprint differs), "create_all" (reflect every table on each start) or "off"
+SCHEMA_STARTUP = os.getenv("SCHEMA_STARTUP", "fingerprint").lower()
+# Connections opened per engine before the app reports ready (capped at the pool size)
+STARTUP_WARM_CONNECTIONS = int(os.getenv("STARTUP_WARM_CONNECTIONS", "2"))
+# Companies and categories preloaded into the entity cache at startup (0 = off)
+STARTUP_WARM_CACHE_ROWS = int(os.getenv("STARTUP_WARM_CACHE_ROWS", "100"))
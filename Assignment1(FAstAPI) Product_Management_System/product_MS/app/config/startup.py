@@ -0,0 +1,79 @@
+"""
+Work done once per worker before it reports ready: schema check, opening
+pool connections and filling the entity cache. Timings end up in
+/health/startup.
+"""
+import time
+from contextlib import contextmanager
+from sqlalchemy import select, text
+from app.config.pool import POOL_CONFIG
+from app.utils.cache import entity_cache
+from app.utils.lookups import ENTITY_MODELS
+
+
+def warm_connections(count: int) -> int:
+    """Number of connections to open per engine (never more than the pool keeps)"""
+    return max(0, min(count, POOL_CONFIG["pool_size"]))
+
+
+def warm_pool(engine, count: int) -> int:
+    """Open `count` connections at once and hand them back to the pool"""
+    connections = []
+    try:
+        for _ in range(warm_connections(count)):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+async def warm_async_pool(async_engine, count: int) -> int:
+    """warm_pool for an AsyncEngine"""
+    connections = []
+    try:
+        for _ in range(warm_connections(count)):
+            conn = await async_engine.connect()
+            connections.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+    return len(connections)
+
+
+def warm_entity_cache(session_factory, rows: int) -> int:
+    """
+    Preload the first `rows` companies and categories for the GET-by-id
+    handlers, as the same response models the read path caches
+    """
+    if rows <= 0 or not entity_cache.enabled:
+        return 0
+    loaded = 0
+    generation = entity_cache.generation
+    with session_factory() as db:
+        for entity, (model, schema) in ENTITY_MODELS.items():
+            for obj in db.scalars(select(model).order_by(model.id).limit(rows)):
+                entity_cache.set((entity, obj.id), schema.model_validate(obj), generation=generation)
+                loaded += 1
+    return loaded
+
+
+class StartupTimer:
+    """Collects named phase durations (seconds)"""
+
+    def __init__(self):
+        self.phases = {}
+        self.ready = False
+        self.import_seconds = None
+        self.schema = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - started, 4)
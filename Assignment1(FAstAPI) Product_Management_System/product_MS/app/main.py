@@ -1,29 +1,111 @@
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
-from app.config.database import engine, Base, SessionLocal,get_db
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.config.database import engine, Base, SessionLocal,get_db, replica_set
+from app.config.replicas import ReadYourWritesMiddleware
 from app.models import Company, Product, Category
 from sqlalchemy.orm import Session
 from app.schemas.company import CompanyCreate,CompanyResponse
 from app.schemas.product import ProductCreate, ProductResponse
 from app.schemas.category import CategoryCreate,CategoryResponse
 from app.routes import company_routes,product_routes,categories_routes
+from app.config.settings import DB_MODE, SLOW_QUERY_LOG_FILE, SCHEMA_STARTUP, STARTUP_WARM_CONNECTIONS, STARTUP_WARM_CACHE_ROWS
+from app.config.schema import ensure_schema
+from app.config.startup import StartupTimer, warm_pool, warm_async_pool, warm_entity_cache
+from app.utils.stats import diff_product_stats, rebuild_product_stats
+from app.utils.changes import backfill_change_versions
+from app.utils.counts import count_cache, diff_row_counts, rebuild_row_counts
+from app.config.pool import pool_report
+from app.utils.cache import entity_cache
+from app.utils.coalesce import coalescer, async_coalescer
+from app.utils.etag import ETagMiddleware
+from app.utils.metrics import MetricsMiddleware, instrument_engine as instrument_metrics, render_metrics
+from app.utils.slow_queries import instrument_slow_queries, slow_query_log
 
-# Create all tables
-print("Creating database tables...")
-Base.metadata.create_all(bind=engine)
-print("Tables created successfully!")
+startup = StartupTimer()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs once per worker before it accepts requests (nothing touches the
+    database at import time): schema check, pool and cache warm-up
+    """
+    started = time.perf_counter()
+    with startup.phase("schema"):
+        startup.schema = ensure_schema(engine, Base.metadata, SCHEMA_STARTUP)
+    print("Database schema changed, tables created" if startup.schema["changed"] else "Database schema up to date")
+    if startup.schema["changed"]:
+        # product_stats may be new (or stale): bring it in line with products once
+        with SessionLocal() as db:
+            if diff_product_stats(db):
+                rebuild_product_stats(db)
+                db.commit()
+        # Rows that predate change tracking join the feed with fresh versions
+        with SessionLocal() as db:
+            if backfill_change_versions(db):
+                db.commit()
+        # Same for the row counters behind X-Total-Count
+        with SessionLocal() as db:
+            if diff_row_counts(db):
+                rebuild_row_counts(db)
+                db.commit()
+    with startup.phase("pool"):
+        warm_pool(engine, STARTUP_WARM_CONNECTIONS)
+        if DB_MODE == "async":
+            from app.config.async_database import async_engine
+            await warm_async_pool(async_engine, STARTUP_WARM_CONNECTIONS)
+    with startup.phase("cache"):
+        warm_entity_cache(SessionLocal, STARTUP_WARM_CACHE_ROWS)
+    startup.phases["total"] = round(time.perf_counter() - started, 4)
+    startup.ready = True
+    print(f"Startup finished in {startup.phases['total']}s (import {startup.import_seconds}s)")
+    yield
+    if SLOW_QUERY_LOG_FILE:
+        slow_query_log.dump(SLOW_QUERY_LOG_FILE)
 
 # Initialize FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Product Management API",
     description="REST API with PostgreSQL",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
 )
-# Include routers
-app.include_router(company_routes.router)
-app.include_router(product_routes.router)
-app.include_router(categories_routes.router)
+# Strong ETags + 304 Not Modified on all GET endpoints
+app.add_middleware(ETagMiddleware)
+# Per-route latency / size / SQL metrics (outermost, so it also times the ETag work)
+app.add_middleware(MetricsMiddleware)
+def instrument_engine(sync_engine, label):
+    """Metrics and slow-query log for one engine"""
+    instrument_metrics(sync_engine, label)
+    instrument_slow_queries(sync_engine, label)
+
+instrument_engine(engine, "primary")
+
+# Read replicas: clients that just wrote keep reading from the primary for a while
+if replica_set is not None:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Include routers (DB_MODE=async swaps in the AsyncSession based handlers)
+if DB_MODE == "async":
+    from app.routes import async_company_routes, async_product_routes, async_categories_routes
+    app.include_router(async_company_routes.router)
+    app.include_router(async_product_routes.router)
+    app.include_router(async_categories_routes.router)
+    from app.config.async_database import async_engine, async_replica_set
+    instrument_engine(async_engine.sync_engine, "primary_async")
+    for replica in (async_replica_set.replicas if async_replica_set else []):
+        instrument_engine(replica.engine.sync_engine, replica.name)
+else:
+    app.include_router(company_routes.router)
+    app.include_router(product_routes.router)
+    app.include_router(categories_routes.router)
+    for replica in (replica_set.replicas if replica_set else []):
+        instrument_engine(replica.engine, replica.name)
 
 @app.get("/")
 def root():
@@ -63,6 +145,65 @@ def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "API is running"}
 
+@app.get("/health/ready")
+def readiness():
+    """503 until the startup work (schema check, warm-up) has finished"""
+    if not startup.ready:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return {"status": "ready"}
+
+@app.get("/health/startup")
+def startup_report():
+    """Import time and per-phase startup time of this worker"""
+    return {
+        "ready": startup.ready,
+        "import_seconds": startup.import_seconds,
+        "phases": startup.phases,
+        "schema": startup.schema,
+    }
+
+@app.get("/health/replicas")
+def replica_health():
+    """Last known health and replication lag of each read replica"""
+    if DB_MODE == "async":
+        from app.config.async_database import async_replica_set as active_replicas
+    else:
+        active_replicas = replica_set
+    return {"replicas": active_replicas.status() if active_replicas else []}
+
+@app.get("/health/pool")
+def pool_health():
+    """Pool profile plus occupancy, checkout wait percentiles and connection ages per engine"""
+    return pool_report()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics (text exposition format)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit/miss/eviction counters of the GET-by-id entity cache, plus request coalescing and search count cache counters"""
+    active_coalescer = async_coalescer if DB_MODE == "async" else coalescer
+    return {**entity_cache.stats(), "coalescing": active_coalescer.stats(), "counts": count_cache.stats()}
+
+@app.get("/admin/slow-queries")
+def slow_queries():
+    """Most recent statements over SLOW_QUERY_MS, newest first, with route and EXPLAIN plan"""
+    return slow_query_log.report()
+
+@app.delete("/admin/slow-queries", status_code=204)
+def clear_slow_queries():
+    """Empty the slow-query buffer"""
+    slow_query_log.clear()
+
+@app.post("/admin/slow-queries/dump")
+def dump_slow_queries():
+    """Append the buffer to SLOW_QUERY_LOG_FILE (JSON lines)"""
+    if not SLOW_QUERY_LOG_FILE:
+        raise HTTPException(status_code=400, detail="SLOW_QUERY_LOG_FILE is not configured")
+    return {"file": SLOW_QUERY_LOG_FILE, "written": slow_query_log.dump(SLOW_QUERY_LOG_FILE)}
+
 @app.post("/companies/", response_model=CompanyResponse, status_code=201)
 def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
     """
@@ -158,3 +299,6 @@ def get_category(category_id: int, db: Session = Depends(get_db)):
             detail=f"Category with ID {category_id} not found"
         )
     return category
+
+# Everything above (routers, middleware, models) is what a worker pays before startup
+startup.import_seconds = round(time.perf_counter() - _import_started, 4)
@@ -1,3 +1,6 @@
 from app.models.company import Company
 from app.models.product import Product
 from app.models.category import Category
+from app.models.product_stats import ProductStats
+from app.models.change import ChangeVersion, ChangeCounter
+from app.models.row_count import RowCount
@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Integer, String
+from app.config.database import Base
+
+class ChangeVersion(Base):
+    """
+    Latest change version of every product, company and category, including
+    deleted ones (tombstones). Written by app/utils/changes.py on every write
+    and read by the /changes feeds.
+    """
+    __tablename__ = "change_versions"
+    
+    # "product", "company" or "category"
+    entity = Column(String(20), primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Feed reads: WHERE entity = ? AND version > ? ORDER BY version
+    __table_args__ = (
+        Index("ix_change_versions_entity_version", "entity", "version"),
+    )
+    
+    def __repr__(self):
+        return f"<ChangeVersion({self.entity}={self.entity_id}, version={self.version}, deleted={self.deleted})>"
+
+
+class ChangeCounter(Base):
+    """One-row counter the change versions are drawn from"""
+    __tablename__ = "change_counter"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
@@ -15,5 +15,11 @@ class Product(Base):
     # Relationship
     company = relationship("Company", backref="products")
     
+    # Per-group price lookups (min/max recompute for product_stats)
+    __table_args__ = (
+        Index("ix_products_company_price", "company_id", "price"),
+        Index("ix_products_category_price", "category", "price"),
+    )
+    
     def __repr__(self):
         return f"<Product(id={self.id}, name='{self.name}', price={self.price})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float
+from app.config.database import Base
+
+class ProductStats(Base):
+    """
+    Running product aggregates per company and per category, maintained by
+    the product write paths (app/utils/stats.py) instead of GROUP BY scans
+    """
+    __tablename__ = "product_stats"
+    
+    # "company" (key = company id) or "category" (key = Product.category)
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    price_sum = Column(Float, nullable=False, default=0.0)
+    min_price = Column(Float, nullable=True)
+    max_price = Column(Float, nullable=True)
+    
+    def __repr__(self):
+        return f"<ProductStats({self.dimension}={self.key}, count={self.product_count})>"
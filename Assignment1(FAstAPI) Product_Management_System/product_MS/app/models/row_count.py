@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, String
+from app.config.database import Base
+
+class RowCount(Base):
+    """
+    Live row count per entity, kept up to date by the write paths
+    (app/utils/counts.py) so listings can report a total without COUNT(*)
+    """
+    __tablename__ = "row_counts"
+    
+    # "product", "company" or "category"
+    entity = Column(String(20), primary_key=True)
+    row_count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RowCount({self.entity}={self.row_count})>"
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.config.async_database import get_async_db, get_async_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import page_query, page_items
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count
+from app.utils.lookups import parse_ids, async_get_by_id, async_get_many
+from app.utils.bulk import apply_named_bulk
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import CategoryChangesResponse
+from app.utils.changes import load_changes
+from app.schemas.stats import CategoryStatsResponse
+from app.utils.stats import category_stats_query, stats_payload
+from app.models.category import Category
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryBulkRequest
+
+router = APIRouter(
+    prefix="/categories",
+    tags=["Categories"]
+)
+
+async def fetch_category(db: AsyncSession, category_id: int) -> Category:
+    """Load a category by ID or raise 404"""
+    result = await db.execute(select(Category).filter(Category.id == category_id))
+    category = result.scalar_one_or_none()
+    if not category:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category with ID {category_id} not found"
+        )
+    return category
+
+@router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new category"""
+    # Check duplicate
+    existing = await db.execute(select(Category.id).filter(Category.name == category.name))
+    if existing.first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Category '{category.name}' already exists"
+        )
+    
+    # Create category
+    db_category = Category(**category.dict())
+    db.add(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    
+    return db_category
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_categories(payload: CategoryBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many categories in one transaction with per-item results"""
+    return await db.run_sync(lambda session: apply_named_bulk(session, Category, "category", "Category", payload))
+
+@router.get("/", response_model=List[CategoryResponse])
+async def list_categories(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these categories (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get list of all categories (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(CategoryResponse, await async_get_many(db, "category", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *await db.run_sync(entity_count, "category"))
+    result = await db.execute(page_query(select(Category), Category, after, skip, limit))
+    categories = page_items(result.scalars().all(), response, limit)
+    return list_response(CategoryResponse, categories, response)
+
+@router.get("/stats", response_model=List[CategoryStatsResponse])
+async def category_stats(db: AsyncSession = Depends(get_async_read_db)):
+    """Product count and min/avg/max price per product category (from product_stats, no scan)"""
+    return [{"category": row.key, **stats_payload(row)} for row in await db.scalars(category_stats_query())]
+
+@router.get("/changes", response_model=CategoryChangesResponse)
+async def category_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Categories created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return await db.run_sync(lambda session: load_changes(session, "category", since, limit))
+
+@router.get("/{category_id}", response_model=CategoryResponse)
+async def get_category(category_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a single category by ID (concurrent cache misses share one query)"""
+    category = await async_get_by_id(db, "category", category_id)
+    if category is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category with ID {category_id} not found"
+        )
+    return category
+
+@router.put("/{category_id}", response_model=CategoryResponse)
+async def update_category(
+    category_id: int, 
+    category_update: CategoryUpdate, 
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing category"""
+    db_category = await fetch_category(db, category_id)
+    
+    # Update fields
+    update_data = category_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_category, key, value)
+    
+    await db.commit()
+    await db.refresh(db_category)
+    entity_cache.invalidate(("category", category_id))
+    
+    return db_category
+
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a category"""
+    db_category = await fetch_category(db, category_id)
+    
+    await db.delete(db_category)
+    await db.commit()
+    entity_cache.invalidate(("category", category_id))
+    
+    return None
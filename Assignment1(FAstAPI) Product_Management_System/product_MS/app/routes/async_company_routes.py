@@ -0,0 +1,140 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.config.async_database import get_async_db, get_async_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import page_query, page_items
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count
+from app.utils.lookups import parse_ids, async_get_by_id, async_get_many
+from app.utils.bulk import apply_named_bulk
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import CompanyChangesResponse
+from app.utils.changes import load_changes
+from app.schemas.stats import CompanyStatsResponse
+from app.utils.stats import company_stats_query, stats_payload
+from app.models.company import Company
+from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyBulkRequest
+
+router = APIRouter(
+    prefix="/companies",
+    tags=["Companies"]
+)
+
+async def fetch_company(db: AsyncSession, company_id: int) -> Company:
+    """Load a company by ID or raise 404"""
+    result = await db.execute(select(Company).filter(Company.id == company_id))
+    company = result.scalar_one_or_none()
+    if not company:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company with ID {company_id} not found"
+        )
+    return company
+
+@router.post("/", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
+async def create_company(company: CompanyCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new company"""
+    # Check if company already exists
+    existing = await db.execute(select(Company.id).filter(Company.name == company.name))
+    if existing.first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Company '{company.name}' already exists"
+        )
+    
+    # Create new company
+    db_company = Company(**company.dict())
+    db.add(db_company)
+    await db.commit()
+    await db.refresh(db_company)
+    
+    return db_company
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_companies(payload: CompanyBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many companies in one transaction with per-item results"""
+    return await db.run_sync(lambda session: apply_named_bulk(session, Company, "company", "Company", payload))
+
+@router.get("/", response_model=List[CompanyResponse])
+async def list_companies(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these companies (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get list of all companies with pagination (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(CompanyResponse, await async_get_many(db, "company", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *await db.run_sync(entity_count, "company"))
+    result = await db.execute(page_query(select(Company), Company, after, skip, limit))
+    companies = page_items(result.scalars().all(), response, limit)
+    return list_response(CompanyResponse, companies, response)
+
+@router.get("/changes", response_model=CompanyChangesResponse)
+async def company_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Companies created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return await db.run_sync(lambda session: load_changes(session, "company", since, limit))
+
+@router.get("/{company_id}", response_model=CompanyResponse)
+async def get_company(company_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a single company by ID (concurrent cache misses share one query)"""
+    company = await async_get_by_id(db, "company", company_id)
+    if company is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company with ID {company_id} not found"
+        )
+    return company
+
+@router.get("/{company_id}/stats", response_model=CompanyStatsResponse)
+async def get_company_stats(company_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Product count and min/avg/max price for one company (from product_stats, no scan)"""
+    if not (await db.execute(select(Company.id).filter(Company.id == company_id))).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company with ID {company_id} not found"
+        )
+    row = (await db.scalars(company_stats_query(company_id))).first()
+    return {"company_id": company_id, **stats_payload(row)}
+
+@router.put("/{company_id}", response_model=CompanyResponse)
+async def update_company(
+    company_id: int, 
+    company_update: CompanyUpdate, 
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing company"""
+    db_company = await fetch_company(db, company_id)
+    
+    # Update fields
+    update_data = company_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_company, key, value)
+    
+    await db.commit()
+    await db.refresh(db_company)
+    entity_cache.invalidate(("company", company_id))
+    
+    return db_company
+
+@router.delete("/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_company(company_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a company"""
+    db_company = await fetch_company(db, company_id)
+    
+    await db.delete(db_company)
+    await db.commit()
+    entity_cache.invalidate(("company", company_id))
+    
+    return None
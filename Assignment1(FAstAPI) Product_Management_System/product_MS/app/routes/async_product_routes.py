@@ -0,0 +1,194 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from app.config.async_database import get_async_db, get_async_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import page_query, page_items
+from app.utils.search import apply_search
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count, product_search_count
+from app.utils.lookups import parse_ids, async_get_by_id, async_get_many
+from app.utils.projections import product_rows_select, product_items
+from app.utils.bulk import apply_product_bulk
+from app.utils.stats import product_snapshot, record_product_changes
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import ProductChangesResponse
+from app.utils.changes import load_changes
+from app.models.product import Product
+from app.models.company import Company
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductBulkRequest
+
+router = APIRouter(
+    prefix="/products",
+    tags=["Products"]
+)
+
+def product_select():
+    """Base product select with the company joined in (async sessions cannot lazy load)"""
+    return select(Product).options(joinedload(Product.company))
+
+async def fetch_product(db: AsyncSession, product_id: int, reload: bool = False) -> Product:
+    """Load a product with its company by ID or raise 404"""
+    stmt = product_select().filter(Product.id == product_id)
+    if reload:
+        stmt = stmt.execution_options(populate_existing=True)
+    product = (await db.execute(stmt)).scalar_one_or_none()
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with ID {product_id} not found"
+        )
+    return product
+
+async def ensure_company(db: AsyncSession, company_id: int):
+    """Raise 400 if the referenced company does not exist"""
+    company = await db.execute(select(Company.id).filter(Company.id == company_id))
+    if not company.first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Company with ID {company_id} not found"
+        )
+
+@router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new product"""
+    # Verify company exists
+    await ensure_company(db, product.company_id)
+    
+    # Create product
+    db_product = Product(**product.dict())
+    db.add(db_product)
+    added = [product_snapshot(db_product)]
+    await db.run_sync(lambda session: record_product_changes(session, added=added))
+    await db.commit()
+    
+    return await fetch_product(db, db_product.id, reload=True)
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_products(payload: ProductBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many products in one transaction with per-item results"""
+    return await db.run_sync(lambda session: apply_product_bulk(session, payload))
+
+@router.get("/", response_model=List[ProductResponse])
+async def list_products(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these products (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get list of all products with nested company details (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(ProductResponse, await async_get_many(db, "product", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *await db.run_sync(entity_count, "product"))
+    result = await db.execute(page_query(product_rows_select(), Product, after, skip, limit))
+    products = page_items(product_items(result.all()), response, limit)
+    return list_response(ProductResponse, products, response)
+
+@router.get("/search", response_model=List[ProductResponse])
+async def search_products(
+    response: Response,
+    q: Optional[str] = Query(None, description="Search in name, category, description"),
+    company_id: Optional[int] = Query(None, description="Filter by company ID"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (estimate uses planner statistics for very large results)"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Search products with multiple filters (same parameters as the sync router)"""
+    # Start with base query (plain columns, no ORM instances to build)
+    query = product_rows_select()
+    
+    # Apply search filter (indexed, results ordered by relevance)
+    rank = None
+    if q:
+        query, rank = apply_search(query, db.bind.dialect.name, q)
+    
+    # Apply company filter
+    if company_id:
+        query = query.filter(Product.company_id == company_id)
+    
+    # Apply price filters
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    
+    # Total for "page X of Y" (counters or a cached/estimated count, see app/utils/counts.py)
+    if count:
+        set_total_count(response, *await db.run_sync(lambda session: product_search_count(session, query, count, q, company_id, min_price, max_price)))
+    
+    # Apply pagination
+    result = await db.execute(page_query(query, Product, after, skip, limit, rank))
+    products = page_items(product_items(result.all(), rank), response, limit, rank)
+    
+    return list_response(ProductResponse, products, response)
+
+@router.get("/changes", response_model=ProductChangesResponse)
+async def product_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Products created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return await db.run_sync(lambda session: load_changes(session, "product", since, limit))
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a single product by ID with nested company details (concurrent cache misses share one query)"""
+    product = await async_get_by_id(db, "product", product_id)
+    if product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with ID {product_id} not found"
+        )
+    return product
+
+@router.put("/{product_id}", response_model=ProductResponse)
+async def update_product(
+    product_id: int,
+    product_update: ProductUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing product"""
+    db_product = await fetch_product(db, product_id)
+    
+    # If company_id is being updated, verify it exists
+    update_data = product_update.dict(exclude_unset=True)
+    if "company_id" in update_data:
+        await ensure_company(db, update_data["company_id"])
+    
+    # Update fields
+    removed = [product_snapshot(db_product)]
+    for key, value in update_data.items():
+        setattr(db_product, key, value)
+    added = [product_snapshot(db_product)]
+    await db.run_sync(lambda session: record_product_changes(session, removed=removed, added=added))
+    
+    await db.commit()
+    entity_cache.invalidate(("product", product_id))
+    
+    return await fetch_product(db, product_id, reload=True)
+
+@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a product"""
+    db_product = await fetch_product(db, product_id)
+    
+    await db.delete(db_product)
+    removed = [product_snapshot(db_product)]
+    await db.run_sync(lambda session: record_product_changes(session, removed=removed))
+    await db.commit()
+    entity_cache.invalidate(("product", product_id))
+
+    return None
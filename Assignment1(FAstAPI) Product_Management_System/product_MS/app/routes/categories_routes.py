@@ -1,9 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.config.database import get_db
+from typing import List, Optional
+from app.config.database import get_db, get_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import paginate
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count
+from app.utils.lookups import parse_ids, get_by_id, get_many
+from app.utils.bulk import apply_named_bulk
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import CategoryChangesResponse
+from app.utils.changes import load_changes
+from app.schemas.stats import CategoryStatsResponse
+from app.utils.stats import category_stats_query, stats_payload
 from app.models.category import Category
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryBulkRequest
 
 router = APIRouter(
     prefix="/categories",
@@ -29,21 +41,48 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     
     return db_category
 
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_categories(payload: CategoryBulkRequest, db: Session = Depends(get_db)):
+    """Create, update and delete many categories in one transaction with per-item results"""
+    return apply_named_bulk(db, Category, "category", "Category", payload)
+
 @router.get("/", response_model=List[CategoryResponse])
 def list_categories(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these categories (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: Session = Depends(get_read_db)
+):
+    """Get list of all categories (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(CategoryResponse, get_many(db, "category", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *entity_count(db, "category"))
+    categories = paginate(db.query(Category), Category, response, after, skip, limit)
+    return list_response(CategoryResponse, categories, response)
+
+@router.get("/stats", response_model=List[CategoryStatsResponse])
+def category_stats(db: Session = Depends(get_read_db)):
+    """Product count and min/avg/max price per product category (from product_stats, no scan)"""
+    return [{"category": row.key, **stats_payload(row)} for row in db.scalars(category_stats_query())]
+
+@router.get("/changes", response_model=CategoryChangesResponse)
+def category_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
 ):
-    """Get list of all categories"""
-    categories = db.query(Category).offset(skip).limit(limit).all()
-    return categories
+    """Categories created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return load_changes(db, "category", since, limit)
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    """Get a single category by ID"""
-    category = db.query(Category).filter(Category.id == category_id).first()
-    if not category:
+def get_category(category_id: int, db: Session = Depends(get_read_db)):
+    """Get a single category by ID (concurrent cache misses share one query)"""
+    category = get_by_id(db, "category", category_id)
+    if category is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Category with ID {category_id} not found"
@@ -72,6 +111,7 @@ def update_category(
     
     db.commit()
     db.refresh(db_category)
+    entity_cache.invalidate(("category", category_id))
     
     return db_category
 
@@ -87,5 +127,6 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_category)
     db.commit()
+    entity_cache.invalidate(("category", category_id))
     
     return None
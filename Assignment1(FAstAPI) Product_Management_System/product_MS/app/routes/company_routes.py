@@ -1,9 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.config.database import get_db
+from typing import List, Optional
+from app.config.database import get_db, get_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import paginate
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count
+from app.utils.lookups import parse_ids, get_by_id, get_many
+from app.utils.bulk import apply_named_bulk
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import CompanyChangesResponse
+from app.utils.changes import load_changes
+from app.schemas.stats import CompanyStatsResponse
+from app.utils.stats import company_stats_query, stats_payload
 from app.models.company import Company
-from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
+from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyBulkRequest
 
 router = APIRouter(
     prefix="/companies",
@@ -29,27 +41,60 @@ def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
     
     return db_company
 
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_companies(payload: CompanyBulkRequest, db: Session = Depends(get_db)):
+    """Create, update and delete many companies in one transaction with per-item results"""
+    return apply_named_bulk(db, Company, "company", "Company", payload)
+
 @router.get("/", response_model=List[CompanyResponse])
 def list_companies(
-    skip: int = 0, 
-    limit: int = 10, 
-    db: Session = Depends(get_db)
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these companies (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: Session = Depends(get_read_db)
 ):
-    """Get list of all companies with pagination"""
-    companies = db.query(Company).offset(skip).limit(limit).all()
-    return companies
+    """Get list of all companies with pagination (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(CompanyResponse, get_many(db, "company", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *entity_count(db, "company"))
+    companies = paginate(db.query(Company), Company, response, after, skip, limit)
+    return list_response(CompanyResponse, companies, response)
+
+@router.get("/changes", response_model=CompanyChangesResponse)
+def company_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """Companies created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return load_changes(db, "company", since, limit)
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-def get_company(company_id: int, db: Session = Depends(get_db)):
-    """Get a single company by ID"""
-    company = db.query(Company).filter(Company.id == company_id).first()
-    if not company:
+def get_company(company_id: int, db: Session = Depends(get_read_db)):
+    """Get a single company by ID (concurrent cache misses share one query)"""
+    company = get_by_id(db, "company", company_id)
+    if company is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Company with ID {company_id} not found"
         )
     return company
 
+@router.get("/{company_id}/stats", response_model=CompanyStatsResponse)
+def get_company_stats(company_id: int, db: Session = Depends(get_read_db)):
+    """Product count and min/avg/max price for one company (from product_stats, no scan)"""
+    if not db.query(Company.id).filter(Company.id == company_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company with ID {company_id} not found"
+        )
+    row = db.scalars(company_stats_query(company_id)).first()
+    return {"company_id": company_id, **stats_payload(row)}
+
 @router.put("/{company_id}", response_model=CompanyResponse)
 def update_company(
     company_id: int, 
@@ -72,6 +117,7 @@ def update_company(
     
     db.commit()
     db.refresh(db_company)
+    entity_cache.invalidate(("company", company_id))
     
     return db_company
 
@@ -87,5 +133,6 @@ def delete_company(company_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_company)
     db.commit()
+    entity_cache.invalidate(("company", company_id))
     
     return None
@@ -1,10 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
+from app.config.settings import MAX_PAGE_SIZE
+from app.utils.pagination import page_query, page_items
+from app.utils.search import apply_search
+from app.utils.cache import entity_cache
+from app.utils.serialization import list_response
+from app.utils.counts import CountMode, set_total_count, entity_count, product_search_count
+from app.utils.lookups import parse_ids, get_by_id, get_many
+from app.utils.projections import product_rows_select, product_items
+from app.utils.bulk import apply_product_bulk
+from app.utils.stats import product_snapshot, record_product_changes
+from app.schemas.bulk import BulkResponse
+from app.schemas.changes import ProductChangesResponse
+from app.utils.changes import load_changes
 from app.models.product import Product
 from app.models.company import Company
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductBulkRequest
 
 router = APIRouter(
     prefix="/products",
@@ -25,50 +38,66 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     # Create product
     db_product = Product(**product.dict())
     db.add(db_product)
+    record_product_changes(db, added=[product_snapshot(db_product)])
     db.commit()
     db.refresh(db_product)
     
     return db_product
 
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_products(payload: ProductBulkRequest, db: Session = Depends(get_db)):
+    """Create, update and delete many products in one transaction with per-item results"""
+    return apply_product_bulk(db, payload)
+
 @router.get("/", response_model=List[ProductResponse])
 def list_products(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated IDs: return just these products (one query, pagination ignored)"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (read from a maintained counter, no COUNT(*))"),
+    db: Session = Depends(get_read_db)
 ):
-    """Get list of all products with nested company details"""
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return products
+    """Get list of all products with nested company details (pass `after` for keyset pagination)"""
+    if ids:
+        return list_response(ProductResponse, get_many(db, "product", parse_ids(ids)), response)
+    if count:
+        set_total_count(response, *entity_count(db, "product"))
+    rows = db.execute(page_query(product_rows_select(), Product, after, skip, limit)).all()
+    products = page_items(product_items(rows), response, limit)
+    return list_response(ProductResponse, products, response)
 
 @router.get("/search", response_model=List[ProductResponse])
 def search_products(
+    response: Response,
     q: Optional[str] = Query(None, description="Search in name, category, description"),
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: Optional[CountMode] = Query(None, description="exact or estimate: add X-Total-Count (estimate uses planner statistics for very large results)"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Search products with multiple filters:
-    - q: Search text in name, category, description
+    - q: Search text in name, category, description (word prefixes, best matches first)
     - company_id: Filter by specific company
     - min_price: Minimum price filter
     - max_price: Maximum price filter
+    - after: Keyset pagination cursor (preferred for deep pages)
     - skip, limit: Pagination
+    - count: Add X-Total-Count / X-Total-Count-Type (exact, or estimate for very large results)
     """
-    # Start with base query
-    query = db.query(Product)
+    # Start with base query (plain columns, no ORM instances to build)
+    query = product_rows_select()
     
-    # Apply search filter
+    # Apply search filter (indexed, results ordered by relevance)
+    rank = None
     if q:
-        search_filter = (
-            Product.name.ilike(f"%{q}%") |
-            Product.category.ilike(f"%{q}%") |
-            Product.description.ilike(f"%{q}%")
-        )
-        query = query.filter(search_filter)
+        query, rank = apply_search(query, db.get_bind().dialect.name, q)
     
     # Apply company filter
     if company_id:
@@ -81,16 +110,30 @@ def search_products(
     if max_price is not None:
         query = query.filter(Product.price <= max_price)
     
+    # Total for "page X of Y" (counters or a cached/estimated count, see app/utils/counts.py)
+    if count:
+        set_total_count(response, *product_search_count(db, query, count, q, company_id, min_price, max_price))
+    
     # Apply pagination
-    products = query.offset(skip).limit(limit).all()
+    rows = db.execute(page_query(query, Product, after, skip, limit, rank)).all()
+    products = page_items(product_items(rows, rank), response, limit, rank)
     
-    return products
+    return list_response(ProductResponse, products, response)
+
+@router.get("/changes", response_model=ProductChangesResponse)
+def product_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page; omit for a full initial sync"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """Products created, updated or deleted after `since`, oldest change first (follow next_token while has_more)"""
+    return load_changes(db, "product", since, limit)
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    """Get a single product by ID with nested company details"""
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
+def get_product(product_id: int, db: Session = Depends(get_read_db)):
+    """Get a single product by ID with nested company details (concurrent cache misses share one query)"""
+    product = get_by_id(db, "product", product_id)
+    if product is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product with ID {product_id} not found"
@@ -123,11 +166,14 @@ def update_product(
             )
     
     # Update fields
+    before = product_snapshot(db_product)
     for key, value in update_data.items():
         setattr(db_product, key, value)
+    record_product_changes(db, removed=[before], added=[product_snapshot(db_product)])
     
     db.commit()
     db.refresh(db_product)
+    entity_cache.invalidate(("product", product_id))
     
     return db_product
 
@@ -142,6 +188,8 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
         )
     
     db.delete(db_product)
+    record_product_changes(db, removed=[product_snapshot(db_product)])
     db.commit()
+    entity_cache.invalidate(("product", product_id))
 
     return None
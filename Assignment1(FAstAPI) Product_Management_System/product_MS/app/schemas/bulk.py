@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+# Upper bound on items per list in a single bulk request
+BULK_MAX_ITEMS = 10000
+
+
+class BulkItemResult(BaseModel):
+    op: str                      # "create", "update" or "delete"
+    index: int                   # position of the item in its request list
+    id: Optional[int] = None
+    status: int                  # HTTP-style status for this item
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    items: List[BulkItemResult] = []
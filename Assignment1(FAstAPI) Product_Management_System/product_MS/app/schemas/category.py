@@ -1,12 +1,14 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional
+from app.schemas.bulk import BULK_MAX_ITEMS
 
 
 class CategoryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Category name (required)")
     description: Optional[str] = Field(None, description="Category description (optional)")
     
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_be_empty(cls, v):
         if not v or v.strip() == "":
             raise ValueError('Category name cannot be empty or whitespace only')
@@ -25,5 +27,14 @@ class CategoryUpdate(BaseModel):
 class CategoryResponse(CategoryBase):
     id: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryBulkUpdate(CategoryUpdate):
+    id: int = Field(..., gt=0)
+
+
+class CategoryBulkRequest(BaseModel):
+    create: List[CategoryCreate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    update: List[CategoryBulkUpdate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    delete: List[int] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.category import CategoryResponse
+from app.schemas.company import CompanyResponse
+from app.schemas.product import ProductBase
+
+
+class ChangeFeedResponse(BaseModel):
+    next_token: str
+    has_more: bool
+
+
+class ChangeBase(BaseModel):
+    id: int
+    version: int
+    deleted: bool
+
+
+class ProductChangeData(ProductBase):
+    """A product as the feed carries it: company_id only, company data comes from the company feed"""
+    id: int
+
+
+class ProductChange(ChangeBase):
+    data: Optional[ProductChangeData] = None
+
+
+class CompanyChange(ChangeBase):
+    data: Optional[CompanyResponse] = None
+
+
+class CategoryChange(ChangeBase):
+    data: Optional[CategoryResponse] = None
+
+
+class ProductChangesResponse(ChangeFeedResponse):
+    changes: List[ProductChange]
+
+
+class CompanyChangesResponse(ChangeFeedResponse):
+    changes: List[CompanyChange]
+
+
+class CategoryChangesResponse(ChangeFeedResponse):
+    changes: List[CategoryChange]
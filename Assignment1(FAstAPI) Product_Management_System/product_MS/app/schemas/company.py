@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional
+from app.schemas.bulk import BULK_MAX_ITEMS
 
 
 class CompanyBase(BaseModel):
@@ -7,13 +8,15 @@ class CompanyBase(BaseModel):
     description: Optional[str] = Field(None, description="Company description (optional)")
     website: Optional[str] = Field(None, description="Company website URL (optional)")
     
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_be_empty(cls, v):
         if not v or v.strip() == "":
             raise ValueError('Name cannot be empty or whitespace only')
         return v.strip()
     
-    @validator('website')
+    @field_validator('website')
+    @classmethod
     def validate_website(cls, v):
         if v and not (v.startswith('http://') or v.startswith('https://')):
             raise ValueError('Website must start with http:// or https://')
@@ -33,5 +36,14 @@ class CompanyUpdate(BaseModel):
 class CompanyResponse(CompanyBase):
     id: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CompanyBulkUpdate(CompanyUpdate):
+    id: int = Field(..., gt=0)
+
+
+class CompanyBulkRequest(BaseModel):
+    create: List[CompanyCreate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    update: List[CompanyBulkUpdate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    delete: List[int] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
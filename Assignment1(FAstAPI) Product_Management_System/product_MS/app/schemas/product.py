@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional
+from app.schemas.bulk import BULK_MAX_ITEMS
 from app.schemas.company import CompanyResponse
 
 
@@ -13,7 +14,8 @@ class ProductBase(BaseModel):
 
 class ProductCreate(ProductBase):
     
-    @validator('price')
+    @field_validator('price')
+    @classmethod
     def validate_price(cls, v):
         if v <= 0:
             raise ValueError('Price must be greater than 0')
@@ -32,5 +34,14 @@ class ProductResponse(ProductBase):
     id: int
     company: CompanyResponse
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBulkUpdate(ProductUpdate):
+    id: int = Field(..., gt=0)
+
+
+class ProductBulkRequest(BaseModel):
+    create: List[ProductCreate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    update: List[ProductBulkUpdate] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    delete: List[int] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class ProductStatsResponse(BaseModel):
+    product_count: int = 0
+    min_price: Optional[float] = None
+    avg_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class CompanyStatsResponse(ProductStatsResponse):
+    company_id: int
+
+
+class CategoryStatsResponse(ProductStatsResponse):
+    category: str
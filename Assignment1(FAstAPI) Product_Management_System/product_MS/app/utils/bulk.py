@@ -0,0 +1,218 @@
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import Session
+from app.models.company import Company
+from app.models.product import Product
+from app.schemas.bulk import BulkItemResult, BulkResponse
+from app.utils.cache import entity_cache
+from app.utils.changes import record_changes
+from app.utils.counts import record_count_delta, mark_counts_stale
+from app.utils.stats import record_product_changes
+
+# Order of operations inside a bulk request (also the order of result items)
+OPS = ("create", "update", "delete")
+
+# Foreign keys that block deleting a row of the key's target: model -> (column, label)
+DEPENDENTS = {Company: (Product.company_id, "products")}
+
+
+def existing_ids(db: Session, model, ids) -> set:
+    """One set-based query: which of these primary keys exist"""
+    if not ids:
+        return set()
+    return set(db.scalars(select(model.id).where(model.id.in_(set(ids)))))
+
+
+def apply_bulk(db: Session, model, entity: str, creates, updates, deletes, failures, before_commit=None) -> BulkResponse:
+    """
+    Write pre-validated items in one transaction:
+    - creates: [(index, values)]      -> one multi-row INSERT ... RETURNING id
+    - updates: [(index, id, values)]  -> one executemany UPDATE by primary key
+    - deletes: [(index, id)]          -> one DELETE ... WHERE id IN (...)
+    failures are BulkItemResult entries for items rejected during validation.
+    before_commit, if given, runs after the writes inside the same transaction.
+    The statements bypass the unit of work, so change versions and row counts
+    are recorded here.
+    """
+    result = BulkResponse(failed=len(failures))
+    items = list(failures)
+
+    new_ids = []
+    if creates:
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        new_ids = db.scalars(stmt, [values for _, values in creates]).all()
+        for (index, _), new_id in zip(creates, new_ids):
+            items.append(BulkItemResult(op="create", index=index, id=new_id, status=201))
+        result.created = len(new_ids)
+
+    rows = [{"id": item_id, **values} for _, item_id, values in updates if values]
+    if rows:
+        db.execute(update(model), rows)
+    for index, item_id, _ in updates:
+        items.append(BulkItemResult(op="update", index=index, id=item_id, status=200))
+    result.updated = len(updates)
+
+    removed = 0
+    if deletes:
+        removed = db.execute(delete(model).where(model.id.in_({item_id for _, item_id in deletes}))).rowcount
+    for index, item_id in deletes:
+        items.append(BulkItemResult(op="delete", index=index, id=item_id, status=204))
+    result.deleted = len(deletes)
+
+    record_changes(db, entity, list(new_ids) + [row["id"] for row in rows], [item_id for _, item_id in deletes])
+    record_count_delta(db, entity, len(new_ids) - removed)
+    mark_counts_stale(db)
+
+    if before_commit is not None:
+        before_commit()
+    db.commit()
+
+    for item_id in {item_id for _, item_id, _ in updates} | {item_id for _, item_id in deletes}:
+        entity_cache.invalidate((entity, item_id))
+
+    result.items = sorted(items, key=lambda item: (OPS.index(item.op), item.index))
+    return result
+
+
+def not_found(op, index, item_id, label):
+    return BulkItemResult(op=op, index=index, id=item_id, status=404, detail=f"{label} with ID {item_id} not found")
+
+
+def null_columns(model, values) -> list:
+    """Non-nullable columns an update explicitly sets to null"""
+    return [
+        column.name for column in model.__table__.columns
+        if not column.nullable and column.name in values and values[column.name] is None
+    ]
+
+
+def null_update(model, index, item_id, values):
+    """422 result if the update nulls a required column, else None"""
+    columns = null_columns(model, values)
+    if not columns:
+        return None
+    return BulkItemResult(op="update", index=index, id=item_id, status=422, detail=f"{', '.join(columns)} cannot be null")
+
+
+def referenced_ids(db: Session, model, ids) -> set:
+    """One grouped query: which of these rows other tables still point at"""
+    dependent = DEPENDENTS.get(model)
+    if dependent is None or not ids:
+        return set()
+    column, _ = dependent
+    return set(db.scalars(select(column).where(column.in_(set(ids))).group_by(column)))
+
+
+def apply_named_bulk(db: Session, model, entity: str, label: str, payload) -> BulkResponse:
+    """Bulk write for companies/categories, enforcing unique names set-wise"""
+    failures = []
+    known = existing_ids(db, model, [item.id for item in payload.update] + payload.delete)
+
+    # Names already in the table, plus names claimed earlier in this batch
+    names = {item.name for item in payload.create} | {item.name for item in payload.update if item.name}
+    taken = dict(db.execute(select(model.name, model.id).where(model.name.in_(names))).all()) if names else {}
+
+    creates = []
+    for index, item in enumerate(payload.create):
+        if item.name in taken:
+            failures.append(BulkItemResult(op="create", index=index, status=400, detail=f"{label} '{item.name}' already exists"))
+            continue
+        taken[item.name] = None
+        creates.append((index, item.dict()))
+
+    updates = []
+    for index, item in enumerate(payload.update):
+        if item.id not in known:
+            failures.append(not_found("update", index, item.id, label))
+            continue
+        values = item.dict(exclude_unset=True, exclude={"id"})
+        invalid = null_update(model, index, item.id, values)
+        if invalid is not None:
+            failures.append(invalid)
+            continue
+        name = values.get("name")
+        if name is not None and taken.get(name, item.id) != item.id:
+            failures.append(BulkItemResult(op="update", index=index, id=item.id, status=400, detail=f"{label} '{name}' already exists"))
+            continue
+        if name is not None:
+            taken[name] = item.id
+        updates.append((index, item.id, values))
+
+    # Rows still referenced are reported per item instead of failing the batch
+    in_use = referenced_ids(db, model, [item_id for item_id in payload.delete if item_id in known])
+    deletes = []
+    for index, item_id in enumerate(payload.delete):
+        if item_id not in known:
+            failures.append(not_found("delete", index, item_id, label))
+            continue
+        if item_id in in_use:
+            failures.append(BulkItemResult(
+                op="delete", index=index, id=item_id, status=409,
+                detail=f"{label} with ID {item_id} still has {DEPENDENTS[model][1]}"
+            ))
+            continue
+        deletes.append((index, item_id))
+
+    return apply_bulk(db, model, entity, creates, updates, deletes, failures)
+
+
+def apply_product_bulk(db: Session, payload) -> BulkResponse:
+    """Bulk write for products, checking company foreign keys with one query"""
+    failures = []
+    company_ids = [item.company_id for item in payload.create] + \
+        [item.company_id for item in payload.update if item.company_id is not None]
+    companies = existing_ids(db, Company, company_ids)
+    known = existing_ids(db, Product, [item.id for item in payload.update] + payload.delete)
+
+    def missing_company(op, index, item_id, company_id):
+        return BulkItemResult(op=op, index=index, id=item_id, status=400, detail=f"Company with ID {company_id} not found")
+
+    creates = []
+    for index, item in enumerate(payload.create):
+        if item.company_id not in companies:
+            failures.append(missing_company("create", index, None, item.company_id))
+            continue
+        creates.append((index, item.dict()))
+
+    updates = []
+    for index, item in enumerate(payload.update):
+        if item.id not in known:
+            failures.append(not_found("update", index, item.id, "Product"))
+            continue
+        values = item.dict(exclude_unset=True, exclude={"id"})
+        invalid = null_update(Product, index, item.id, values)
+        if invalid is not None:
+            failures.append(invalid)
+            continue
+        if "company_id" in values and values["company_id"] not in companies:
+            failures.append(missing_company("update", index, item.id, values["company_id"]))
+            continue
+        updates.append((index, item.id, values))
+
+    deletes = []
+    for index, item_id in enumerate(payload.delete):
+        if item_id not in known:
+            failures.append(not_found("delete", index, item_id, "Product"))
+            continue
+        deletes.append((index, item_id))
+
+    # Aggregates: old state of touched rows out, their final state (plus creates) in
+    changed_ids = {item_id for _, item_id, _ in updates} | {item_id for _, item_id in deletes}
+    old = {
+        row.id: (row.company_id, row.category, row.price)
+        for row in db.execute(
+            select(Product.id, Product.company_id, Product.category, Product.price).where(Product.id.in_(changed_ids))
+        )
+    } if changed_ids else {}
+    final = dict(old)
+    for _, item_id, values in updates:
+        company_id, category, price = final[item_id]
+        final[item_id] = (values.get("company_id", company_id), values.get("category", category), values.get("price", price))
+    for _, item_id in deletes:
+        final.pop(item_id, None)
+    removed = list(old.values())
+    added = [(values["company_id"], values["category"], values["price"]) for _, values in creates] + list(final.values())
+
+    return apply_bulk(
+        db, Product, "product", creates, updates, deletes, failures,
+        before_commit=lambda: record_product_changes(db, removed, added),
+    )
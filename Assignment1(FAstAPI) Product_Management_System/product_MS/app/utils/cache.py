@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from app.config.settings import ENTITY_CACHE_MAX_ENTRIES, ENTITY_CACHE_TTL_SECONDS
+
+
+class EntityCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+    Keys are (entity, id) tuples, e.g. ("product", 7). An entry can be tagged
+    with other keys it depends on; invalidating a key also drops every entry
+    tagged with it (a cached product is tagged with its company).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()   # key -> (expires_at, value, tags)
+        self._tagged = {}               # tag -> set of keys depending on it
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so in-flight loads don't store stale rows
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key):
+        """Return the cached value or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=(), generation=None):
+        """
+        Store a value. Pass the generation read before loading it from the
+        database; the value is dropped if an invalidation happened meanwhile.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tuple(tags))
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a key and every entry tagged with it"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            if key in self._entries:
+                self._remove(key)
+            for dependent in self._tagged.pop(key, ()):
+                if dependent in self._entries:
+                    self._remove(dependent)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key):
+        # Caller holds the lock
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+# Shared cache for get_company / get_product / get_category
+entity_cache = EntityCache(ENTITY_CACHE_MAX_ENTRIES, ENTITY_CACHE_TTL_SECONDS)
@@ -0,0 +1,191 @@
+"""
+Change versions and the /changes feeds.
+
+Every write to a product, company or category stamps the row's entry in
+change_versions with the next value of a one-row counter. Deletes stamp it
+too and set deleted=True (a tombstone). A feed page is then an index range
+scan on (entity, version), so a client that keeps its token only reads what
+changed since its last sync.
+
+- ORM writes (add / attribute changes / delete) are picked up by an
+  after_flush listener on every Session, sync or async.
+- Bulk statements bypass the unit of work, so app/utils/bulk.py calls
+  record_changes itself.
+
+Feed entries carry each row's own columns only. A product references its
+company by company_id; a company edit shows up in the company feed alone, so
+mirrors follow both feeds instead of the product feed holding company
+copies that a company update would leave stale.
+
+The counter row is updated first in the writing transaction and stays
+locked until commit. Versions therefore become visible in order, and a
+reader never sees version N+1 while N is still uncommitted.
+"""
+import base64
+import binascii
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.change import ChangeCounter, ChangeVersion
+from app.models.company import Company
+from app.models.product import Product
+from app.utils.projections import PRODUCT_FIELDS
+
+# Models with a change feed, by the entity name used in change_versions
+TRACKED = {Product: "product", Company: "company", Category: "category"}
+
+# Rows per INSERT when backfilling versions for untracked rows
+BACKFILL_BATCH = 5000
+
+
+def encode_change_token(version: int) -> str:
+    """Opaque token for the last version a client has seen"""
+    payload = json.dumps({"v": version}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> int:
+    """Decode a token produced by encode_change_token, 400 on anything else"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version = json.loads(base64.urlsafe_b64decode(padded))["v"]
+        if not isinstance(version, int) or version < 0:
+            raise ValueError
+        return version
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid change token"
+        )
+
+
+def _next_versions(conn, count: int) -> range:
+    """Reserve `count` consecutive versions; locks the counter row until commit"""
+    bump = update(ChangeCounter).where(ChangeCounter.id == 1).values(version=ChangeCounter.version + count)
+    if conn.execute(bump).rowcount == 0:
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(ChangeCounter).values(id=1, version=count))
+        except IntegrityError:
+            # A concurrent writer created the row first
+            conn.execute(bump)
+    last = conn.execute(select(ChangeCounter.version).where(ChangeCounter.id == 1)).scalar_one()
+    return range(last - count + 1, last + 1)
+
+
+def record_changes(conn, entity: str, changed=(), deleted=()):
+    """
+    Stamp new versions on rows of one entity inside the caller's transaction.
+    conn: a Connection or Session; changed/deleted: primary keys.
+    """
+    states = {entity_id: False for entity_id in changed}
+    states.update({entity_id: True for entity_id in deleted})
+    if not states:
+        return
+    ids = sorted(states)
+    versions = _next_versions(conn, len(ids))
+    now = datetime.now(timezone.utc)
+    conn.execute(
+        delete(ChangeVersion).where(ChangeVersion.entity == entity, ChangeVersion.entity_id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    conn.execute(insert(ChangeVersion), [
+        {"entity": entity, "entity_id": entity_id, "version": version, "deleted": states[entity_id], "changed_at": now}
+        for entity_id, version in zip(ids, versions)
+    ])
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    """Collect the tracked rows this flush inserted, changed or deleted"""
+    changed = defaultdict(set)
+    deleted = defaultdict(set)
+    for obj in session.new:
+        entity = TRACKED.get(type(obj))
+        if entity is not None:
+            changed[entity].add(obj.id)
+    for obj in session.dirty:
+        entity = TRACKED.get(type(obj))
+        if entity is not None and session.is_modified(obj, include_collections=False):
+            changed[entity].add(obj.id)
+    for obj in session.deleted:
+        entity = TRACKED.get(type(obj))
+        if entity is not None:
+            deleted[entity].add(obj.id)
+    if not changed and not deleted:
+        return
+    conn = session.connection()
+    # Fixed order, same as the other write paths
+    for entity in sorted(set(changed) | set(deleted)):
+        record_changes(conn, entity, changed[entity] - deleted[entity], deleted[entity])
+
+
+def backfill_change_versions(db: Session) -> int:
+    """Give rows written outside the ORM (seeds, imports) a version; returns how many"""
+    total = 0
+    for model, entity in TRACKED.items():
+        tracked = select(ChangeVersion.entity_id).where(ChangeVersion.entity == entity)
+        missing = db.scalars(select(model.id).where(model.id.not_in(tracked)).order_by(model.id)).all()
+        for start in range(0, len(missing), BACKFILL_BATCH):
+            record_changes(db, entity, missing[start:start + BACKFILL_BATCH])
+        total += len(missing)
+    return total
+
+
+def _load_products(db: Session, ids):
+    columns = [getattr(Product, field) for field in PRODUCT_FIELDS]
+    rows = db.execute(select(*columns).where(Product.id.in_(ids))).all()
+    return {row.id: dict(zip(PRODUCT_FIELDS, row)) for row in rows}
+
+
+def _load_models(model):
+    def load(db: Session, ids):
+        return {obj.id: obj for obj in db.scalars(select(model).where(model.id.in_(ids)))}
+    return load
+
+
+CHANGE_LOADERS = {
+    "product": _load_products,
+    "company": _load_models(Company),
+    "category": _load_models(Category),
+}
+
+
+def load_changes(db: Session, entity: str, since=None, limit: int = 100) -> dict:
+    """
+    One feed page: rows of `entity` changed after the `since` token, oldest
+    change first, with their current data (None for tombstones).
+    Without a token the feed starts at the beginning, i.e. a full sync.
+    """
+    after = decode_change_token(since) if since else 0
+    rows = db.execute(
+        select(ChangeVersion.entity_id, ChangeVersion.version, ChangeVersion.deleted)
+        .where(ChangeVersion.entity == entity, ChangeVersion.version > after)
+        .order_by(ChangeVersion.version)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    live = [row.entity_id for row in rows if not row.deleted]
+    data = CHANGE_LOADERS[entity](db, live) if live else {}
+    changes = [
+        {
+            "id": row.entity_id,
+            "version": row.version,
+            # Deleted after its version was read: the tombstone follows on a later page
+            "deleted": row.deleted or row.entity_id not in data,
+            "data": data.get(row.entity_id),
+        }
+        for row in rows
+    ]
+    return {
+        "changes": changes,
+        "next_token": encode_change_token(rows[-1].version if rows else after),
+        "has_more": has_more,
+    }
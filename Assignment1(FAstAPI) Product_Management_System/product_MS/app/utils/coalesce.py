@@ -0,0 +1,167 @@
+"""
+Request coalescing for GET-by-id lookups.
+
+A cache miss does not query on its own. It joins the batch that is
+collecting ids for the same (entity, engine) group. The first caller leads
+the batch: it waits COALESCE_WINDOW_MS for more ids, then runs one
+`WHERE id IN (...)` and hands every waiter its row. A lookup for an id that
+an already running batch is fetching waits for that batch (single flight).
+
+The entity cache generation is part of the rule. A batch only takes
+callers that saw the same generation, so a read issued after a write never
+reuses a query that started before the write's invalidation. A caller that
+joined a running batch and got nothing re-checks on its own, because the
+row may have been created after that query began.
+
+Coalescer serves the threadpool (sync) handlers and AsyncCoalescer the
+event loop (async) handlers.
+"""
+import asyncio
+import threading
+import time
+from app.config.settings import COALESCE_WINDOW_MS, COALESCE_MAX_BATCH
+
+
+class _Batch:
+    __slots__ = ("ids", "generation", "done", "results", "error")
+
+    def __init__(self, generation, done):
+        self.ids = set()
+        self.generation = generation
+        self.done = done
+        self.results = {}
+        self.error = None
+
+
+class _CoalescerState:
+    """Bookkeeping shared by the sync and async variants (caller serializes access)"""
+
+    def __init__(self, window_ms: float, max_batch: int):
+        self.window = window_ms / 1000
+        self.max_batch = max(max_batch, 1)
+        self._open = {}      # group -> batch still collecting ids
+        self._running = {}   # group -> {id: batch fetching it}
+        self.requests = 0
+        self.batches = 0
+        self.shared = 0
+
+    def _join(self, group, item_id, generation, new_done):
+        """(batch, leader, joined_running) for one lookup"""
+        self.requests += 1
+        running = self._running.get(group, {}).get(item_id)
+        if running is not None and running.generation == generation:
+            self.shared += 1
+            return running, False, True
+        batch = self._open.get(group)
+        if batch is None or batch.generation != generation or len(batch.ids) >= self.max_batch:
+            batch = _Batch(generation, new_done())
+            self._open[group] = batch
+            self.batches += 1
+            leader = True
+        else:
+            self.shared += 1
+            leader = False
+        batch.ids.add(item_id)
+        return batch, leader, False
+
+    def _close(self, group, batch) -> list:
+        """Stop collecting; the ids are now in flight"""
+        if self._open.get(group) is batch:
+            del self._open[group]
+        ids = sorted(batch.ids)
+        running = self._running.setdefault(group, {})
+        for item_id in ids:
+            running[item_id] = batch
+        return ids
+
+    def _finish(self, group, batch):
+        if self._open.get(group) is batch:
+            del self._open[group]
+        running = self._running.get(group, {})
+        for item_id in batch.ids:
+            if running.get(item_id) is batch:
+                del running[item_id]
+        if not running:
+            self._running.pop(group, None)
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "requests": self.requests,
+            "batches": self.batches,
+            "shared": self.shared,
+        }
+
+
+class Coalescer(_CoalescerState):
+    """Thread-safe variant for sync handlers"""
+
+    def __init__(self, window_ms: float, max_batch: int):
+        super().__init__(window_ms, max_batch)
+        self._lock = threading.Lock()
+
+    def load(self, group, item_id, fetch, generation):
+        """Value for item_id (None if missing); fetch(ids) -> {id: value} runs once per batch"""
+        with self._lock:
+            batch, leader, joined_running = self._join(group, item_id, generation, threading.Event)
+        if leader:
+            if self.window:
+                time.sleep(self.window)
+            with self._lock:
+                ids = self._close(group, batch)
+            try:
+                batch.results = fetch(ids)
+            except Exception as e:
+                batch.error = e
+            finally:
+                with self._lock:
+                    self._finish(group, batch)
+                batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        value = batch.results.get(item_id)
+        if value is None and joined_running:
+            value = fetch([item_id]).get(item_id)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return super().stats()
+
+
+class AsyncCoalescer(_CoalescerState):
+    """Event-loop variant for async handlers (one loop, so no lock)"""
+
+    async def load(self, group, item_id, fetch, generation):
+        """Like Coalescer.load; fetch(ids) is a coroutine function"""
+        batch, leader, joined_running = self._join(group, item_id, generation, asyncio.Event)
+        if leader:
+            try:
+                if self.window:
+                    await asyncio.sleep(self.window)
+                batch.results = await fetch(self._close(group, batch))
+            except BaseException as e:
+                batch.error = e
+                if not isinstance(e, Exception):
+                    raise
+            finally:
+                self._finish(group, batch)
+                batch.done.set()
+        else:
+            await batch.done.wait()
+        if batch.error is not None:
+            if isinstance(batch.error, Exception):
+                raise batch.error
+            # The leading request was cancelled (client went away): fetch alone
+            return (await fetch([item_id])).get(item_id)
+        value = batch.results.get(item_id)
+        if value is None and joined_running:
+            value = (await fetch([item_id])).get(item_id)
+        return value
+
+
+coalescer = Coalescer(COALESCE_WINDOW_MS, COALESCE_MAX_BATCH)
+async_coalescer = AsyncCoalescer(COALESCE_WINDOW_MS, COALESCE_MAX_BATCH)
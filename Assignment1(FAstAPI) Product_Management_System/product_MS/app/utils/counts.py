@@ -0,0 +1,184 @@
+"""
+Total counts for the list and search endpoints (?count= -> X-Total-Count).
+
+- Unfiltered listings read row_counts, a per-entity counter the write paths
+  keep current: ORM writes through an after_flush listener, bulk statements
+  through record_count_delta (app/utils/bulk.py). Counting is one primary
+  key lookup, whatever the table size.
+- A company-only product search reads that company's product_stats row.
+- Other filtered searches run COUNT(*) over the filtered query once and
+  cache it per filter combination (COUNT_CACHE_TTL_SECONDS). A commit that
+  touched a tracked table drops this process's cached counts. Counts read
+  from a replica are returned but not cached (the replica may lag).
+- ?count=estimate asks PostgreSQL's planner for the row estimate instead and
+  only counts exactly when the estimate is below COUNT_ESTIMATE_THRESHOLD.
+
+X-Total-Count-Type tells the client what it got: "exact", "cached" (exact
+when computed, at most COUNT_CACHE_TTL_SECONDS old) or "estimated".
+"""
+import json
+from typing import Literal
+from fastapi import Response
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config.replicas import served_by_replica
+from app.config.settings import COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS, COUNT_ESTIMATE_THRESHOLD
+from app.models.product_stats import ProductStats
+from app.models.row_count import RowCount
+from app.utils.cache import EntityCache
+from app.utils.changes import TRACKED
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+COUNT_TYPE_HEADER = "X-Total-Count-Type"
+
+# Values of the ?count= query parameter
+CountMode = Literal["exact", "estimate"]
+
+# entity name -> model with a maintained row count
+COUNTED = {entity: model for model, entity in TRACKED.items()}
+
+# Session.info flag: this transaction wrote rows a cached count may include
+_STALE = "counts_stale"
+
+# Exact counts of filtered searches, keyed by entity and filter values
+count_cache = EntityCache(COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS)
+
+
+def set_total_count(response: Response, total: int, kind: str):
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[COUNT_TYPE_HEADER] = kind
+
+
+def record_count_delta(conn, entity: str, delta: int):
+    """
+    Add delta to the entity's row count inside the caller's transaction.
+    conn: a Connection or Session. A missing counter row is created from a
+    COUNT(*), which already includes this transaction's rows.
+    """
+    if not delta:
+        return
+    bump = update(RowCount).where(RowCount.entity == entity).values(row_count=RowCount.row_count + delta)
+    if conn.execute(bump).rowcount == 0:
+        total = select(func.count()).select_from(COUNTED[entity]).scalar_subquery()
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(RowCount).values(entity=entity, row_count=total))
+        except IntegrityError:
+            # A concurrent writer created the row first; its count lacks our rows
+            conn.execute(bump)
+
+
+def mark_counts_stale(session: Session):
+    """Drop the cached search counts once this transaction commits"""
+    session.info[_STALE] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flush(session, flush_context):
+    """Apply the inserts and deletes of this flush to row_counts"""
+    deltas = {}
+    for obj in session.new:
+        entity = TRACKED.get(type(obj))
+        if entity is not None:
+            deltas[entity] = deltas.get(entity, 0) + 1
+    for obj in session.deleted:
+        entity = TRACKED.get(type(obj))
+        if entity is not None:
+            deltas[entity] = deltas.get(entity, 0) - 1
+    if deltas or any(type(obj) in TRACKED for obj in session.dirty):
+        mark_counts_stale(session)
+    if not deltas:
+        return
+    conn = session.connection()
+    # Fixed order, same as the other write paths
+    for entity in sorted(deltas):
+        record_count_delta(conn, entity, deltas[entity])
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_after_commit(session):
+    if session.info.pop(_STALE, False):
+        count_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_STALE, None)
+
+
+def entity_count(db: Session, entity: str):
+    """(total, kind) for an unfiltered listing"""
+    total = db.scalar(select(RowCount.row_count).where(RowCount.entity == entity))
+    if total is None:
+        # Nothing written since the counters were added: count once
+        total = db.scalar(select(func.count()).select_from(COUNTED[entity]))
+    return total, "exact"
+
+
+def planner_estimate(db: Session, query):
+    """Rows PostgreSQL's planner expects `query` to return; None on other backends"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.compile(dialect=bind.dialect)
+    params = compiled.params
+    if compiled.positiontup:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def filtered_count(db: Session, key, query, mode: str = "exact"):
+    """(total, kind) for a filtered select(); key identifies the filter values"""
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached, "cached"
+    if mode == "estimate":
+        estimate = planner_estimate(db, query)
+        if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+            return estimate, "estimated"
+    generation = count_cache.generation
+    total = db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    if not served_by_replica(db):
+        count_cache.set(key, total, generation=generation)
+    return total, "exact"
+
+
+def product_search_count(db: Session, query, mode, q=None, company_id=None, min_price=None, max_price=None):
+    """(total, kind) for /products/search; maintained counters where the filters allow"""
+    if not q and min_price is None and max_price is None:
+        if not company_id:
+            return entity_count(db, "product")
+        total = db.scalar(
+            select(ProductStats.product_count)
+            .where(ProductStats.dimension == "company", ProductStats.key == str(company_id))
+        )
+        return total or 0, "exact"
+    return filtered_count(db, ("product", q, company_id or None, min_price, max_price), query, mode)
+
+
+def recount_rows(db: Session) -> dict:
+    """Exact COUNT(*) per counted entity"""
+    return {entity: db.scalar(select(func.count()).select_from(model)) for entity, model in COUNTED.items()}
+
+
+def diff_row_counts(db: Session) -> list:
+    """Entities whose stored row count differs from COUNT(*)"""
+    stored = dict(db.execute(select(RowCount.entity, RowCount.row_count)).all())
+    return [
+        {"entity": entity, "stored": stored.get(entity), "actual": actual}
+        for entity, actual in recount_rows(db).items()
+        if stored.get(entity) != actual
+    ]
+
+
+def rebuild_row_counts(db: Session) -> int:
+    """Rewrite row_counts from COUNT(*) (caller commits); returns the number of entities"""
+    counts = recount_rows(db)
+    db.execute(delete(RowCount))
+    db.execute(insert(RowCount), [{"entity": entity, "row_count": total} for entity, total in counts.items()])
+    count_cache.clear()
+    return len(counts)
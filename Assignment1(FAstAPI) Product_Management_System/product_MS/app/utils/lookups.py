@@ -0,0 +1,108 @@
+"""
+Lookups by primary key for the GET-by-id handlers and the ?ids= multi-get.
+
+Both go through the entity cache first. Misses are fetched with one
+`WHERE id IN (...)`: a multi-get fetches all of its misses at once, and
+single-id lookups are coalesced with concurrent ones (app/utils/coalesce.py).
+Only rows read from the primary are cached: a lagging replica could put a
+row back that a write has just invalidated, and every client would see it.
+Products come from the column-projected read path, so there is no ORM
+instance and no company lazy load.
+"""
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config.replicas import served_by_replica
+from app.config.settings import MULTI_GET_MAX_IDS
+from app.models.category import Category
+from app.models.company import Company
+from app.models.product import Product
+from app.schemas.category import CategoryResponse
+from app.schemas.company import CompanyResponse
+from app.schemas.product import ProductResponse
+from app.utils.cache import entity_cache
+from app.utils.coalesce import coalescer, async_coalescer
+from app.utils.projections import product_rows_select, product_items
+
+# entity -> (model, response schema) for the plain ORM lookups
+ENTITY_MODELS = {
+    "company": (Company, CompanyResponse),
+    "category": (Category, CategoryResponse),
+}
+
+
+def parse_ids(raw: str) -> list:
+    """Comma-separated positive ids, duplicates dropped, request order kept; 400 otherwise"""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        ids = None
+    if not ids or any(item_id <= 0 for item_id in ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of positive integers"
+        )
+    if len(ids) > MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MULTI_GET_MAX_IDS} ids per request"
+        )
+    return ids
+
+
+def fetch_entities(db: Session, entity: str, ids) -> dict:
+    """One IN query for these ids: {id: response model}, stored in the entity cache if read from the primary"""
+    generation = entity_cache.generation
+    if entity == "product":
+        rows = db.execute(product_rows_select().where(Product.id.in_(ids))).all()
+        values = {item["id"]: ProductResponse.model_validate(item) for item in product_items(rows)}
+    else:
+        model, schema = ENTITY_MODELS[entity]
+        values = {obj.id: schema.model_validate(obj) for obj in db.scalars(select(model).where(model.id.in_(ids)))}
+    if served_by_replica(db):
+        return values
+    for item_id, value in values.items():
+        # A cached product is tagged with its company so company writes drop it too
+        tags = [("company", value.company_id)] if entity == "product" else ()
+        entity_cache.set((entity, item_id), value, tags=tags, generation=generation)
+    return values
+
+
+def get_by_id(db: Session, entity: str, item_id: int):
+    """Cached value, else a coalesced fetch; None if the row does not exist"""
+    cached = entity_cache.get((entity, item_id))
+    if cached is not None:
+        return cached
+    return coalescer.load(
+        (entity, db.bind), item_id, lambda ids: fetch_entities(db, entity, ids), entity_cache.generation
+    )
+
+
+def get_many(db: Session, entity: str, ids) -> list:
+    """Existing rows for these ids in request order (unknown ids are skipped)"""
+    found = {}
+    missing = []
+    for item_id in ids:
+        cached = entity_cache.get((entity, item_id))
+        if cached is not None:
+            found[item_id] = cached
+        else:
+            missing.append(item_id)
+    if missing:
+        found.update(fetch_entities(db, entity, missing))
+    return [found[item_id] for item_id in ids if item_id in found]
+
+
+async def async_get_by_id(db, entity: str, item_id: int):
+    """get_by_id for an AsyncSession"""
+    cached = entity_cache.get((entity, item_id))
+    if cached is not None:
+        return cached
+    return await async_coalescer.load(
+        (entity, db.bind), item_id, lambda ids: db.run_sync(fetch_entities, entity, ids), entity_cache.generation
+    )
+
+
+async def async_get_many(db, entity: str, ids) -> list:
+    """get_many for an AsyncSession"""
+    return await db.run_sync(get_many, entity, ids)
@@ -0,0 +1,216 @@
+"""
+In-process metrics exposed in Prometheus text format on /metrics.
+
+Collection is a bisect plus a few integer increments under a lock per
+observation, cheap enough to leave on in production (unlike echo=True).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, labels=()):
+        """(bucket bounds, per-bucket counts, sum, count) for one label set"""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                return self.buckets, [0] * (len(self.buckets) + 1), 0.0, 0
+            return self.buckets, list(series[0]), series[1], series[2]
+
+    def quantile(self, q, labels=()):
+        """Upper bucket bound containing the q-quantile (None without data)"""
+        bounds, counts, _, total = self.snapshot(labels)
+        if not total:
+            return None
+        target = q * total
+        running = 0
+        for bound, count in zip(bounds + (float("inf"),), counts):
+            running += count
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total_sum, total_count in items:
+            running = 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                le = 'le="' + _format_number(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {running}"
+            inf = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labels, labels, inf)} {total_count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_number(total_sum)}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {total_count}"
+
+
+REQUEST_LABELS = ("method", "route")
+
+http_requests_total = Counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_duration = Histogram("http_request_duration_seconds", "HTTP request latency", LATENCY_BUCKETS, REQUEST_LABELS)
+http_response_size = Histogram("http_response_size_bytes", "HTTP response body size", SIZE_BUCKETS, REQUEST_LABELS)
+db_statements_per_request = Histogram("db_statements_per_request", "SQL statements executed per request", COUNT_BUCKETS, REQUEST_LABELS)
+db_time_per_request = Histogram("db_time_per_request_seconds", "Time spent executing SQL per request", LATENCY_BUCKETS, REQUEST_LABELS)
+db_statement_duration = Histogram("db_statement_duration_seconds", "Latency of individual SQL statements", LATENCY_BUCKETS, ("engine",))
+db_pool_checkout_wait = Histogram("db_pool_checkout_wait_seconds", "Time waiting to check a connection out of the pool", WAIT_BUCKETS, ("engine",))
+
+REGISTRY = [
+    http_requests_total,
+    http_request_duration,
+    http_response_size,
+    db_statements_per_request,
+    db_time_per_request,
+    db_statement_duration,
+    db_pool_checkout_wait,
+]
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "scope")
+
+    def __init__(self, scope=None):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.scope = scope  # ASGI scope, to tell which route issued a statement
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+
+# Per-request SQL counters; the threadpool and greenlets both carry the context over
+current_request_stats: ContextVar = ContextVar("current_request_stats", default=None)
+
+
+def instrument_engine(sync_engine, label: str):
+    """Count and time SQL statements for one engine (pool waits come from app.config.pool)"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        db_statement_duration.observe(elapsed, (label,))
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("metrics_started"):
+            conn.info["metrics_started"].pop()
+
+
+class MetricsMiddleware:
+    """Records latency, status, response size and SQL usage per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        status_code = 500
+        size = 0
+
+        async def counting_send(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            http_requests_total.inc(labels + (str(status_code),))
+            http_request_duration.observe(elapsed, labels)
+            http_response_size.observe(size, labels)
+            db_statements_per_request.observe(stats.statements, labels)
+            db_time_per_request.observe(stats.db_seconds, labels)
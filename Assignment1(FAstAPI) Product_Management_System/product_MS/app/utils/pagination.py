@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int, rank=None) -> str:
+    """Encode the last seen primary key (and relevance rank, if any) as an opaque cursor"""
+    position = {"id": last_id} if rank is None else {"id": last_id, "rank": rank}
+    payload = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor, 400 on anything else"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(position.get("id"), int):
+            raise ValueError
+        if "rank" in position and not isinstance(position["rank"], (int, float)):
+            raise ValueError
+        return position
+    except (binascii.Error, ValueError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def page_query(query, model, after=None, skip=0, limit=10, rank=None):
+    """
+    Apply stable ordering and the page window to an ORM Query or a select().
+    - after: keyset pagination, seeks past the cursor using the PK index
+    - skip: offset pagination, kept for backwards compatibility
+    - rank: optional relevance expression; results are then ordered by
+      rank (best first) with the primary key as tie-breaker
+    One extra row is fetched so page_items can tell whether a next page exists.
+    A limit below 1 yields an empty page (handlers reject it with a 422 first).
+    """
+    if rank is not None:
+        query = query.add_columns(rank).order_by(rank.desc(), model.id)
+    else:
+        query = query.order_by(model.id)
+
+    if after:
+        position = decode_cursor(after)
+        if rank is not None and "rank" in position:
+            query = query.filter(or_(
+                rank < position["rank"],
+                and_(rank == position["rank"], model.id > position["id"])
+            ))
+        else:
+            query = query.filter(model.id > position["id"])
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(max(limit, 0) + 1)
+
+
+def page_items(rows, response: Response, limit=10, rank=None):
+    """Trim the rows fetched by page_query and set X-Next-Cursor when another page exists"""
+    if limit <= 0:
+        return []
+    has_next = len(rows) > limit
+    rows = rows[:limit] if has_next else rows
+
+    if rank is not None:
+        items = [row[0] for row in rows]
+        last_rank = rows[-1][1] if rows else None
+    else:
+        items, last_rank = list(rows), None
+
+    if has_next:
+        last = items[-1]
+        # ORM instances, or plain dicts from the column-projected read paths
+        last_id = last["id"] if isinstance(last, dict) else last.id
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_id, last_rank)
+    return items
+
+
+def paginate(query, model, response: Response, after=None, skip=0, limit=10, rank=None):
+    """Paginate an ORM Query (see page_query for the parameters)"""
+    rows = page_query(query, model, after, skip, limit, rank).all()
+    return page_items(rows, response, limit, rank)
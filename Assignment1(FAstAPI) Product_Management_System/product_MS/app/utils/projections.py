@@ -0,0 +1,45 @@
+"""
+Read-only product rows without ORM instances.
+
+The list, search and GET-by-id handlers only serialize what they load, so
+they select exactly the response columns, with the company joined into the
+same SELECT (one query per page, whatever the page size). Plain rows come
+back: no identity map, no change tracking, no relationship loading. Each row
+is shaped into the dict ProductResponse expects. Only the write paths use ORM
+objects.
+"""
+from sqlalchemy import select
+from app.models.product import Product
+from app.models.company import Company
+
+# Same order as ProductResponse / CompanyResponse, so the JSON is unchanged
+PRODUCT_FIELDS = ("id", "name", "description", "category", "price", "company_id")
+COMPANY_FIELDS = ("id", "name", "description", "website")
+
+_N_PRODUCT = len(PRODUCT_FIELDS)
+_N_COMPANY = len(COMPANY_FIELDS)
+
+
+def product_rows_select():
+    """Column-projected products joined to their company; filters/pagination apply as usual"""
+    return (
+        select(
+            *(getattr(Product, field) for field in PRODUCT_FIELDS),
+            *(getattr(Company, field).label(f"company__{field}") for field in COMPANY_FIELDS),
+        )
+        .join(Company, Product.company_id == Company.id)
+    )
+
+
+def product_item(row) -> dict:
+    """One product_rows_select() row as the nested dict ProductResponse validates"""
+    item = dict(zip(PRODUCT_FIELDS, row[:_N_PRODUCT]))
+    item["company"] = dict(zip(COMPANY_FIELDS, row[_N_PRODUCT:_N_PRODUCT + _N_COMPANY]))
+    return item
+
+
+def product_items(rows, rank=None):
+    """Shape a page_query() result for page_items (rank, when present, is the last column)"""
+    if rank is not None:
+        return [(product_item(row), row[-1]) for row in rows]
+    return [product_item(row) for row in rows]
@@ -0,0 +1,113 @@
+"""
+Full-text search over products (name, category, description).
+
+Backends, picked from the session's dialect:
+- postgresql: GIN index on a tsvector expression, ranked with ts_rank
+- sqlite:     FTS5 external-content table kept in sync by triggers, ranked with bm25
+- otherwise:  the old ILIKE scan, so search keeps working everywhere
+
+All backends match every query token as a prefix ("wid gad" finds "Widget Gadget").
+"""
+import re
+from sqlalchemy import bindparam, func, literal_column, select, text
+from sqlalchemy.engine import Engine
+from app.models.product import Product
+
+# Columns covered by the search index
+SEARCH_COLUMNS = ("name", "category", "description")
+
+_fts5_ready = False
+
+
+def _tsvector_sql(prefix: str = "") -> str:
+    """tsvector expression; index DDL and queries must render it identically"""
+    parts = " || ' ' || ".join(f"coalesce({prefix}{col}, '')" for col in SEARCH_COLUMNS)
+    return f"to_tsvector('simple', {parts})"
+
+
+def _sqlite_fts_ddl():
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_vals = ", ".join(f"new.{col}" for col in SEARCH_COLUMNS)
+    old_vals = ", ".join(f"old.{col}" for col in SEARCH_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE products_fts USING fts5({cols}, content='products', content_rowid='id')",
+        f"""CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, {cols}) VALUES (new.id, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            INSERT INTO products_fts(rowid, {cols}) VALUES (new.id, {new_vals});
+        END""",
+        # Index rows that existed before the search table was created
+        "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+    ]
+
+
+def ensure_search_index(engine: Engine):
+    """Create the search index for the engine's dialect (idempotent, call after create_all)"""
+    global _fts5_ready
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if dialect == "postgresql":
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_products_search ON products USING GIN ({_tsvector_sql()})"
+            ))
+        elif dialect == "sqlite":
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+            )).first()
+            if not exists:
+                try:
+                    for statement in _sqlite_fts_ddl():
+                        conn.execute(text(statement))
+                except Exception as e:
+                    # SQLite built without FTS5: keep using the ILIKE fallback
+                    print(f"FTS5 unavailable, product search falls back to ILIKE: {e}")
+                    return
+            _fts5_ready = True
+
+
+def tokenize(q: str):
+    """Split a search string into lowercase word tokens"""
+    return re.findall(r"\w+", q.lower())
+
+
+def apply_search(query, dialect: str, q: str):
+    """
+    Filter a Product query (ORM Query or select()) by the search text.
+    Returns (query, rank) where rank is a relevance expression (higher is better),
+    or None when the backend cannot rank.
+    """
+    tokens = tokenize(q)
+
+    if tokens and dialect == "postgresql":
+        vector = literal_column(_tsvector_sql("products."))
+        ts_query = func.to_tsquery(
+            literal_column("'simple'"),
+            bindparam("search_q", " & ".join(f"{t}:*" for t in tokens))
+        )
+        query = query.filter(vector.op("@@")(ts_query))
+        return query, func.ts_rank(vector, ts_query)
+
+    if tokens and dialect == "sqlite" and _fts5_ready:
+        fts = literal_column("products_fts")
+        matches = (
+            select(literal_column("rowid").label("id"), func.bm25(fts).label("score"))
+            .select_from(text("products_fts"))
+            .where(fts.op("MATCH")(bindparam("search_q", " ".join(f'"{t}"*' for t in tokens))))
+            .subquery("search_matches")
+        )
+        query = query.join(matches, matches.c.id == Product.id)
+        # bm25 is lower-is-better, flip it so rank sorts descending like ts_rank
+        return query, -matches.c.score
+
+    search_filter = (
+        Product.name.ilike(f"%{q}%") |
+        Product.category.ilike(f"%{q}%") |
+        Product.description.ilike(f"%{q}%")
+    )
+    return query.filter(search_filter), None
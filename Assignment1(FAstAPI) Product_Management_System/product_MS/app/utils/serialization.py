@@ -0,0 +1,180 @@
+"""
+Fast JSON path for list endpoints (FAST_JSON_RESPONSES=true).
+
+For response_model=List[Schema] FastAPI validates the ORM objects through
+their instrumented attributes and then renders the result. Here a cached
+TypeAdapter(List[Schema]) validates fully loaded instances from their
+__dict__ (the loaded column values), which is where most of the time went,
+and pydantic-core writes the JSON bytes directly.
+
+How FastAPI renders the result depends on its version: recent releases
+write the bytes with pydantic-core as well, older ones json.dumps the dumped
+dicts. The two differ only for floats whose repr has an exponent of e-05 to
+e-09 (json.dumps "5e-05", pydantic-core "0.00005"). fastapi_json_style()
+asks the running FastAPI once which of the two it uses. With json.dumps, a
+page is re-rendered that way when one of its float fields holds such a
+value; when the answer is neither, list endpoints leave rendering to
+FastAPI. Bodies are therefore byte-identical with the flag on and off (see
+benchmarks/serialization_benchmark.py).
+"""
+import asyncio
+import json
+import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app.config.settings import FAST_JSON_RESPONSES
+
+# Floats json.dumps and pydantic-core write differently, plus ordinary ones
+_PROBE_VALUES = (1e-07, 5e-05, 1e-05, 0.0001, 0.1, 0.30000000000000004, 1e16, 12345678.9)
+
+
+class _Probe(BaseModel):
+    value: float
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    """Compiled validator/serializer for List[schema], built once per schema"""
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=None)
+def _field_names(schema) -> frozenset:
+    return frozenset(schema.model_fields)
+
+
+def _optional_inner(annotation):
+    """X for Optional[X], the annotation itself otherwise"""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _float_paths(schema) -> Optional[tuple]:
+    """
+    Attribute paths to schema's float fields, nested models included; None
+    when a field could hold a float somewhere these paths do not reach
+    (List[float], Union[...], Any)
+    """
+    paths = []
+    for name, field in schema.model_fields.items():
+        annotation = _optional_inner(field.annotation)
+        if annotation is float:
+            paths.append((name,))
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested = _float_paths(annotation)
+            if nested is None:
+                return None
+            paths.extend((name,) + path for path in nested)
+        elif not isinstance(annotation, type):
+            return None
+    return tuple(paths)
+
+
+def _json_dumps_differs(number) -> bool:
+    """json.dumps and pydantic-core format this float differently (repr exponent e-05..e-09)"""
+    return type(number) is float and abs(number) < 1e-4 and "e-0" in repr(number)
+
+
+def _needs_json_dumps(schema, models) -> bool:
+    paths = _float_paths(schema)
+    if paths is None:
+        return True
+    for model in models:
+        for path in paths:
+            value = model
+            for name in path:
+                value = getattr(value, name)
+                if value is None:
+                    break
+            if _json_dumps_differs(value):
+                return True
+    return False
+
+
+def _json_dumps_render(content) -> bytes:
+    """Starlette's JSONResponse.render"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _asgi_get(app, path) -> bytes:
+    """Body of a GET request handled by app, without a server or an HTTP client"""
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    # Own thread: the caller may already be inside a running event loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(asyncio.run, app(scope, receive, send)).result()
+    return b"".join(body)
+
+
+@lru_cache(maxsize=None)
+def fastapi_json_style() -> str:
+    """
+    How the running FastAPI renders a response_model body: "pydantic-core",
+    "json.dumps" or "unknown"; measured once on a throwaway app
+    """
+    from fastapi import FastAPI
+
+    probe = FastAPI()
+
+    @probe.get("/", response_model=List[_Probe])
+    async def values():
+        return [{"value": value} for value in _PROBE_VALUES]
+
+    body = _asgi_get(probe, "/")
+    adapter = list_adapter(_Probe)
+    models = adapter.validate_python([{"value": value} for value in _PROBE_VALUES])
+    if body == adapter.dump_json(models):
+        return "pydantic-core"
+    if body == _json_dumps_render(adapter.dump_python(models, mode="json")):
+        return "json.dumps"
+    return "unknown"
+
+
+def _loaded_state(obj, fields):
+    """The instance's loaded values when they cover every field, else the instance itself"""
+    state = getattr(obj, "__dict__", None)
+    if state is not None and fields <= state.keys():
+        return state
+    return obj  # expired/unloaded attributes: let attribute access load them
+
+
+def render_json_list(schema, items) -> bytes:
+    """JSON bytes identical to what the running FastAPI produces for response_model=List[schema]"""
+    adapter = list_adapter(schema)
+    fields = _field_names(schema)
+    value = adapter.validate_python([_loaded_state(obj, fields) for obj in items], from_attributes=True)
+    if fastapi_json_style() == "json.dumps" and _needs_json_dumps(schema, value):
+        return _json_dumps_render(adapter.dump_python(value, mode="json"))
+    return adapter.dump_json(value)
+
+
+def list_response(schema, items, response: Response):
+    """
+    Return value for a list handler: the items themselves (FastAPI serializes
+    them) or, with FAST_JSON_RESPONSES on, a ready Response that keeps the
+    headers the handler set on `response` (X-Next-Cursor, ...)
+    """
+    if not FAST_JSON_RESPONSES or fastapi_json_style() == "unknown":
+        return items
+    fast = Response(content=render_json_list(schema, items), media_type="application/json")
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
@@ -0,0 +1,147 @@
+"""
+Slow-query log: statements over SLOW_QUERY_MS, newest last, in a ring buffer.
+
+Each entry keeps the SQL, its parameters with string/bytes values redacted
+(numbers, booleans and NULLs stay, so the filter combination is visible), the
+route that issued it, the elapsed time and, for SELECTs, the EXPLAIN plan.
+The plan is taken on the same connection right after the statement, so it
+is what the planner chose in that transaction.
+"""
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from sqlalchemy import event
+from app.config.settings import SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN
+from app.utils.metrics import current_request_stats
+
+# Prefix per dialect; anything else gets a plain EXPLAIN
+EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+def redact_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (str, bytes)):
+        return f"<redacted {type(value).__name__}({len(value)})>"
+    return f"<redacted {type(value).__name__}>"
+
+
+def redact_parameters(parameters):
+    """Same shape as the DBAPI parameters (dict, sequence, or a list of them), values redacted"""
+    if isinstance(parameters, dict):
+        return {name: redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return [redact_parameters(row) for row in parameters]
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of slow statements"""
+
+    def __init__(self, threshold_ms: float, size: int, explain: bool):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._entries = deque(maxlen=max(size, 1))
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def record(self, entry: dict):
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    def entries(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def dump(self, path: str) -> int:
+        """Append the buffered entries to `path` as JSON lines; returns how many"""
+        entries = self.entries()
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + "\n")
+        return len(entries)
+
+    def report(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "capacity": self._entries.maxlen,
+            "recorded_total": self.recorded,
+            "entries": self.entries()[::-1],  # newest first
+        }
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN)
+
+
+def _is_read(statement: str) -> bool:
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+def _explain(conn, statement, parameters):
+    prefix = EXPLAIN_PREFIX.get(conn.dialect.name, "EXPLAIN ")
+    conn.info["slow_query_explaining"] = True
+    try:
+        if conn.dialect.name == "postgresql":
+            # A failed EXPLAIN must not abort the caller's transaction
+            with conn.begin_nested():
+                rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        else:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        return [" | ".join(str(col) for col in row) for row in rows]
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    finally:
+        conn.info["slow_query_explaining"] = False
+
+
+def instrument_slow_queries(sync_engine, label: str, log: SlowQueryLog = slow_query_log):
+    """Time every statement on this engine and record the slow ones"""
+    if not log.enabled:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if elapsed < log.threshold or conn.info.get("slow_query_explaining"):
+            return
+        stats = current_request_stats.get()
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "engine": label,
+            "route": stats.route if stats is not None else None,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": redact_parameters(parameters),
+            "executemany": executemany,
+            "plan": None,
+        }
+        if log.explain and not executemany and _is_read(statement):
+            entry["plan"] = _explain(conn, statement, parameters)
+        log.record(entry)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("slow_query_started"):
+            conn.info["slow_query_started"].pop()
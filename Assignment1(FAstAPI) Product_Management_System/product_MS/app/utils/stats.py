@@ -0,0 +1,193 @@
+"""
+Product count and min/avg/max price per company and per category.
+
+The product_stats table holds running aggregates. Every product write passes
+the (company_id, category, price) it removed and added to
+record_product_changes, in the same transaction:
+
+- count and sum are updated by delta, in SQL, so concurrent writers don't
+  lose updates
+- min/max grow by comparison. When a removed price was the group's min or
+  max, that bound is re-read from products through the (group, price)
+  indexes. That is one index probe, not a scan.
+
+rebuild_product_stats() / diff_product_stats() recompute everything with a
+GROUP BY for verification; see `python -m app.commands.rebuild_stats`.
+"""
+from collections import defaultdict
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.product_stats import ProductStats
+
+# Relative tolerance when comparing running sums with a recompute
+SUM_TOLERANCE = 1e-6
+
+
+def product_snapshot(product):
+    """The fields the aggregates depend on, taken before/after a change"""
+    return (product.company_id, product.category, product.price)
+
+
+def _groups(company_id, category):
+    return (("company", str(company_id)), ("category", category))
+
+
+def _group_filter(dimension: str, key: str):
+    if dimension == "company":
+        return Product.company_id == int(key)
+    return Product.category == key
+
+
+class _Delta:
+    __slots__ = ("count", "total", "added_min", "added_max", "removed_min", "removed_max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.added_min = self.added_max = self.removed_min = self.removed_max = None
+
+    def add(self, price):
+        self.count += 1
+        self.total += price
+        self.added_min = price if self.added_min is None else min(self.added_min, price)
+        self.added_max = price if self.added_max is None else max(self.added_max, price)
+
+    def remove(self, price):
+        self.count -= 1
+        self.total -= price
+        self.removed_min = price if self.removed_min is None else min(self.removed_min, price)
+        self.removed_max = price if self.removed_max is None else max(self.removed_max, price)
+
+
+def _bound(column, dimension, key, delta, lowest: bool):
+    """New min (lowest=True) or max for the UPDATE, as a SQL expression"""
+    added = delta.added_min if lowest else delta.added_max
+    removed = delta.removed_min if lowest else delta.removed_max
+    better = (lambda a, b: a < b) if lowest else (lambda a, b: a > b)
+    aggregate = func.min if lowest else func.max
+
+    value = column
+    if added is not None:
+        value = case((column.is_(None), added), (better(added, column), added), else_=column)
+    if removed is not None:
+        # The old bound may be gone: read it back from the (group, price) index
+        recompute = select(aggregate(Product.price)).where(_group_filter(dimension, key)).scalar_subquery()
+        hit = column >= removed if lowest else column <= removed
+        value = case((hit, recompute), else_=value)
+    return value
+
+
+def _apply_delta(db: Session, dimension: str, key: str, delta: _Delta):
+    where = (ProductStats.dimension == dimension, ProductStats.key == key)
+    stmt = update(ProductStats).where(*where).values(
+        product_count=ProductStats.product_count + delta.count,
+        price_sum=ProductStats.price_sum + delta.total,
+        min_price=_bound(ProductStats.min_price, dimension, key, delta, lowest=True),
+        max_price=_bound(ProductStats.max_price, dimension, key, delta, lowest=False),
+    ).execution_options(synchronize_session=False)
+    if db.execute(stmt).rowcount == 0 and delta.count > 0:
+        try:
+            with db.begin_nested():
+                db.execute(insert(ProductStats).values(
+                    dimension=dimension, key=key, product_count=delta.count, price_sum=delta.total,
+                    min_price=delta.added_min, max_price=delta.added_max,
+                ))
+        except IntegrityError:
+            # A concurrent writer created the row first
+            db.execute(stmt)
+    if delta.count < 0:
+        db.execute(
+            delete(ProductStats).where(*where, ProductStats.product_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def record_product_changes(db: Session, removed=(), added=()):
+    """
+    Apply product changes to product_stats inside the caller's transaction.
+    removed/added: (company_id, category, price) tuples; an update is one of each.
+    """
+    deltas = defaultdict(_Delta)
+    for company_id, category, price in removed:
+        for group in _groups(company_id, category):
+            deltas[group].remove(price)
+    for company_id, category, price in added:
+        for group in _groups(company_id, category):
+            deltas[group].add(price)
+    if not deltas:
+        return
+    # The min/max recompute must see the product rows as they are now
+    db.flush()
+    # Fixed order, so concurrent transactions lock stats rows in the same sequence
+    for (dimension, key), delta in sorted(deltas.items()):
+        _apply_delta(db, dimension, key, delta)
+
+
+def stats_payload(row) -> dict:
+    """product_stats row (or None) as the response fields"""
+    if row is None or not row.product_count:
+        return {"product_count": 0, "min_price": None, "avg_price": None, "max_price": None}
+    return {
+        "product_count": row.product_count,
+        "min_price": row.min_price,
+        "avg_price": row.price_sum / row.product_count,
+        "max_price": row.max_price,
+    }
+
+
+def company_stats_query(company_id: int):
+    return select(ProductStats).where(ProductStats.dimension == "company", ProductStats.key == str(company_id))
+
+
+def category_stats_query():
+    return select(ProductStats).where(ProductStats.dimension == "category").order_by(ProductStats.key)
+
+
+def recompute_product_stats(db: Session) -> dict:
+    """Full GROUP BY over products: {(dimension, key): (count, sum, min, max)}"""
+    expected = {}
+    for dimension, column in (("company", Product.company_id), ("category", Product.category)):
+        rows = db.execute(
+            select(column, func.count(), func.sum(Product.price), func.min(Product.price), func.max(Product.price))
+            .group_by(column)
+        )
+        for key, count, total, low, high in rows:
+            expected[(dimension, str(key))] = (count, total, low, high)
+    return expected
+
+
+def diff_product_stats(db: Session) -> list:
+    """Groups where product_stats disagrees with a full recompute"""
+    expected = recompute_product_stats(db)
+    stored = {
+        (row.dimension, row.key): (row.product_count, row.price_sum, row.min_price, row.max_price)
+        for row in db.scalars(select(ProductStats))
+    }
+    mismatches = []
+    for group in sorted(set(expected) | set(stored)):
+        want, have = expected.get(group), stored.get(group)
+        if want is not None and have is not None:
+            count_ok = want[0] == have[0]
+            sum_ok = abs(want[1] - have[1]) <= SUM_TOLERANCE * max(1.0, abs(want[1]))
+            if count_ok and sum_ok and want[2:] == have[2:]:
+                continue
+        mismatches.append({
+            "dimension": group[0], "key": group[1],
+            "expected": list(want) if want else None, "stored": list(have) if have else None,
+        })
+    return mismatches
+
+
+def rebuild_product_stats(db: Session) -> int:
+    """Replace product_stats with a full recompute (caller commits); returns the group count"""
+    expected = recompute_product_stats(db)
+    db.execute(delete(ProductStats))
+    if expected:
+        db.execute(insert(ProductStats), [
+            {"dimension": dimension, "key": key, "product_count": count,
+             "price_sum": total, "min_price": low, "max_price": high}
+            for (dimension, key), (count, total, low, high) in expected.items()
+        ])
+    return len(expected)
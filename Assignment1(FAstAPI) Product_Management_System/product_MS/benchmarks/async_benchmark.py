@@ -0,0 +1,128 @@
+"""
+Sync vs async handler throughput under high request concurrency.
+
+Each mode runs in a fresh interpreter (DB_MODE is read at import time) against
+a seeded SQLite file. --latency-ms adds a sleep to every SQL statement inside
+the driver to stand in for the network round-trip of a remote PostgreSQL.
+
+    python benchmarks/async_benchmark.py --requests 2000 --concurrency 200 --latency-ms 20
+
+Needs httpx and aiosqlite in addition to requirements.txt.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import PROJECT_ROOT, seed
+
+
+def add_latency(sync_engine, latency_ms):
+    """
+    Sleep for every statement inside the driver's own thread (sqlite3 trace
+    callback), so sync mode blocks a threadpool worker and async mode blocks
+    the aiosqlite connection thread -- never the event loop.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.util import await_only
+
+    def _sleep(statement):
+        time.sleep(latency_ms / 1000)
+
+    @event.listens_for(sync_engine, "connect")
+    def _install(dbapi_connection, connection_record):
+        driver_connection = getattr(dbapi_connection, "_connection", dbapi_connection)
+        if hasattr(driver_connection, "_execute"):  # aiosqlite
+            await_only(driver_connection.set_trace_callback(_sleep))
+        else:
+            driver_connection.set_trace_callback(_sleep)
+
+
+async def drive(app, path, total, concurrency):
+    import httpx
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return time.perf_counter() - started
+
+
+def worker(args):
+    from app.config import database
+    database.engine.echo = False
+    from app.main import app
+    from app.config.settings import DB_MODE
+    from app.config.schema import ensure_schema
+
+    # ASGITransport does not run the lifespan, so create the tables here
+    ensure_schema(database.engine, database.Base.metadata)
+    seed(database.SessionLocal)
+    if DB_MODE == "async":
+        from app.config.async_database import async_engine
+        add_latency(async_engine.sync_engine, args.latency_ms)
+    else:
+        add_latency(database.engine, args.latency_ms)
+
+    elapsed = asyncio.run(drive(app, args.path, args.requests, args.concurrency))
+    print(json.dumps({
+        "mode": DB_MODE,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "latency_ms": args.latency_ms,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(args.requests / elapsed, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--path", default="/products/?limit=10")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    results = []
+    for mode in ("sync", "async"):
+        env = dict(
+            os.environ,
+            DB_MODE=mode,
+            DATABASE_URL=f"sqlite:///{db_file}",
+            DB_POOL_SIZE=str(args.concurrency),
+            DB_MAX_OVERFLOW="0",
+            PYTHONPATH=PROJECT_ROOT,
+        )
+        env.pop("ASYNC_DATABASE_URL", None)
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker"] + sys.argv[1:],
+            env=env, cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    sync, async_ = results
+    print(json.dumps({
+        "results": results,
+        "async_speedup": round(async_["requests_per_sec"] / sync["requests_per_sec"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Shared helpers for the benchmark scripts (seeding and latency statistics)."""
+import math
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def seed(session_factory, companies=20, products=2000, categories=10):
+    """Insert a synthetic catalog unless the database already has companies"""
+    from sqlalchemy import insert
+    from app.models import Company, Product, Category
+    from app.utils.stats import rebuild_product_stats
+    from app.utils.changes import backfill_change_versions
+    from app.utils.counts import rebuild_row_counts
+
+    db = session_factory()
+    try:
+        if db.query(Company).first():
+            return
+        db.execute(insert(Company), [
+            {"name": f"Company {i}", "website": f"https://company{i}.example.com"}
+            for i in range(companies)
+        ])
+        db.execute(insert(Category), [
+            {"name": f"cat-{i}", "description": f"Category {i}"} for i in range(categories)
+        ])
+        company_ids = [c.id for c in db.query(Company.id)]
+        db.execute(insert(Product), [
+            {"name": f"Product {i}", "category": f"cat-{i % categories}", "price": i % 500 + 0.99,
+             "company_id": company_ids[i % len(company_ids)], "description": "benchmark product"}
+            for i in range(products)
+        ])
+        # Core inserts bypass the incremental aggregates, change versions and row counts
+        rebuild_product_stats(db)
+        backfill_change_versions(db)
+        rebuild_row_counts(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
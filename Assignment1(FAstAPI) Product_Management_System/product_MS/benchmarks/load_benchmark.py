@@ -0,0 +1,237 @@
+"""
+HTTP load benchmark for every company, product and category route.
+
+Seeds a catalog into a throwaway SQLite file (or the database in DATABASE_URL
+with --use-env-db), then drives each route with a fixed number of requests at
+a fixed concurrency and prints machine-readable JSON:
+
+    python benchmarks/load_benchmark.py --products 10000 --requests 500 --concurrency 32 --output bench.json
+    python benchmarks/load_benchmark.py ... --compare bench.json   # ratios against an earlier run
+
+Requests go through the ASGI app in-process by default; pass --base-url to
+measure a running server instead. Needs httpx in addition to requirements.txt.
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from common import PROJECT_ROOT, seed, percentile
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_scenarios(ids, rng):
+    """
+    Route label -> factory returning (method, url, json body) for one request.
+    Delete scenarios consume rows created for them up front (see prepare_deletes).
+    """
+    counter = itertools.count()
+    company_ids, product_ids, category_ids = ids["companies"], ids["products"], ids["categories"]
+
+    def pick(values):
+        return rng.choice(values)
+
+    return {
+        # Companies
+        "POST /companies/": lambda: ("POST", "/companies/", {"name": f"bench-company-{next(counter)}"}),
+        "GET /companies/": lambda: ("GET", "/companies/?limit=10", None),
+        "GET /companies/{company_id}": lambda: ("GET", f"/companies/{pick(company_ids)}", None),
+        "GET /companies/{company_id}/stats": lambda: ("GET", f"/companies/{pick(company_ids)}/stats", None),
+        "PUT /companies/{company_id}": lambda: ("PUT", f"/companies/{pick(company_ids)}", {"description": f"rev {next(counter)}"}),
+        "DELETE /companies/{company_id}": lambda: ("DELETE", f"/companies/{ids['delete_companies'].pop()}", None),
+        "POST /companies/bulk": lambda: ("POST", "/companies/bulk", {
+            "create": [{"name": f"bench-bulk-company-{next(counter)}"} for _ in range(50)]}),
+        # Products
+        "POST /products/": lambda: ("POST", "/products/", {
+            "name": f"bench-product-{next(counter)}", "category": "bench", "price": 9.99, "company_id": pick(company_ids)}),
+        "GET /products/": lambda: ("GET", "/products/?limit=10", None),
+        "GET /products/search": lambda: ("GET", f"/products/search?q=product {rng.randint(1, 99)}&limit=10", None),
+        "GET /products/{product_id}": lambda: ("GET", f"/products/{pick(product_ids)}", None),
+        "PUT /products/{product_id}": lambda: ("PUT", f"/products/{pick(product_ids)}", {"price": rng.randint(1, 999) + 0.5}),
+        "DELETE /products/{product_id}": lambda: ("DELETE", f"/products/{ids['delete_products'].pop()}", None),
+        "POST /products/bulk": lambda: ("POST", "/products/bulk", {"create": [
+            {"name": f"bench-bulk-product-{next(counter)}", "category": "bench", "price": 1.5, "company_id": pick(company_ids)}
+            for _ in range(50)]}),
+        # Categories
+        "POST /categories/": lambda: ("POST", "/categories/", {"name": f"bench-category-{next(counter)}"}),
+        "GET /categories/": lambda: ("GET", "/categories/?limit=10", None),
+        "GET /categories/stats": lambda: ("GET", "/categories/stats", None),
+        "GET /categories/{category_id}": lambda: ("GET", f"/categories/{pick(category_ids)}", None),
+        "PUT /categories/{category_id}": lambda: ("PUT", f"/categories/{pick(category_ids)}", {"description": f"rev {next(counter)}"}),
+        "DELETE /categories/{category_id}": lambda: ("DELETE", f"/categories/{ids['delete_categories'].pop()}", None),
+        "POST /categories/bulk": lambda: ("POST", "/categories/bulk", {
+            "create": [{"name": f"bench-bulk-category-{next(counter)}"} for _ in range(50)]}),
+    }
+
+
+async def prepare_deletes(client, ids, count, company_id):
+    """Create throwaway rows for the DELETE scenarios through the bulk endpoints"""
+    for key, url, make in (
+        ("delete_companies", "/companies/bulk", lambda i: {"name": f"bench-doomed-company-{i}"}),
+        ("delete_categories", "/categories/bulk", lambda i: {"name": f"bench-doomed-category-{i}"}),
+        ("delete_products", "/products/bulk", lambda i: {
+            "name": f"bench-doomed-product-{i}", "category": "bench", "price": 1.0, "company_id": company_id}),
+    ):
+        response = await client.post(url, json={"create": [make(i) for i in range(count)]})
+        response.raise_for_status()
+        ids[key] = [item["id"] for item in response.json()["items"] if item["status"] == 201]
+
+
+async def run_route(client, factory, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        method, url, body = factory()
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(total / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+async def run(args):
+    import httpx
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        # Keep stdout clean for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            from app.config import database
+            database.engine.echo = False
+            from app.main import app
+            from app.config.schema import ensure_schema
+            # ASGITransport does not run the lifespan, so create the tables here
+            ensure_schema(database.engine, database.Base.metadata)
+        seed(database.SessionLocal, args.companies, args.products, args.categories)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    async with client:
+        ids = {}
+        for key, url in (("companies", "/companies/"), ("products", "/products/"), ("categories", "/categories/")):
+            response = await client.get(url, params={"limit": 100})
+            response.raise_for_status()
+            ids[key] = [row["id"] for row in response.json()]
+        await prepare_deletes(client, ids, args.requests, ids["companies"][0])
+
+        rng = random.Random(args.seed)
+        scenarios = build_scenarios(ids, rng)
+        selected = [name for name in scenarios if not args.routes or any(r in name for r in args.routes)]
+
+        results = {}
+        for name in selected:
+            # Short warm-up so connection setup and first-call costs are excluded
+            if args.warmup and not name.startswith("DELETE"):
+                await run_route(client, scenarios[name], args.warmup, args.concurrency)
+            results[name] = await run_route(client, scenarios[name], args.requests, args.concurrency)
+            if not args.quiet:
+                r = results[name]
+                print(f"{name:<36} {r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f} ms  "
+                      f"p95 {r['p95_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}",
+                      file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "target": args.base_url or "in-process ASGI",
+            "database": "env DATABASE_URL" if (args.use_env_db or args.base_url) else "temporary SQLite",
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "dataset": {"companies": args.companies, "products": args.products, "categories": args.categories},
+            "seed": args.seed,
+        },
+        "routes": results,
+    }
+
+
+def compare(report, baseline):
+    """Per-route change against an earlier report (ratios > 1 mean more throughput / more latency)"""
+    changes = {}
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        changes[name] = {
+            "throughput_ratio": round(current["throughput_rps"] / previous["throughput_rps"], 3),
+            "p95_ratio": round(current["p95_ms"] / previous["p95_ms"], 3) if previous["p95_ms"] else None,
+            "p99_ratio": round(current["p99_ms"] / previous["p99_ms"], 3) if previous["p99_ms"] else None,
+        }
+    return {"baseline_commit": baseline.get("meta", {}).get("commit"), "routes": changes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=300, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20, help="warm-up requests per read/write route")
+    parser.add_argument("--routes", nargs="*", help="only run routes whose label contains one of these strings")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for ids and query terms")
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--use-env-db", action="store_true", help="seed DATABASE_URL instead of a temporary SQLite file")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare against (adds a \"comparison\" section)")
+    parser.add_argument("--quiet", action="store_true", help="no per-route progress on stderr")
+    args = parser.parse_args()
+
+    if not args.base_url and not args.use_env_db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+
+    report = asyncio.run(run(args))
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(report, json.load(f))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+ORM vs column-projected Core read path over a full product export.
+
+Seeds a throwaway SQLite file (100k products by default), then reads every
+product with its company both ways and renders the JSON the list endpoints
+would return:
+
+- orm:  select(Product) + joinedload(company), ORM instances (the old path)
+- core: app.utils.projections.product_rows_select, plain rows shaped to dicts
+
+Time per row is CPU time. Memory per row is the tracemalloc peak while the
+rows are loaded, so it shows the cost of holding them. The two JSON outputs
+are checked to be identical. Prints JSON:
+
+    python benchmarks/read_path_benchmark.py --products 100000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import PROJECT_ROOT, seed  # noqa: F401  (PROJECT_ROOT puts the app on sys.path)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+
+def load_orm(db):
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+    from app.models import Product
+
+    return db.scalars(select(Product).options(joinedload(Product.company)).order_by(Product.id)).all()
+
+
+def load_core(db):
+    from app.models import Product
+    from app.utils.projections import product_rows_select, product_items
+
+    return product_items(db.execute(product_rows_select().order_by(Product.id)).all())
+
+
+def measure(session_factory, loader):
+    from app.schemas.product import ProductResponse
+    from app.utils.serialization import render_json_list
+
+    # Timed run (tracemalloc would inflate the timings)
+    gc.collect()
+    with session_factory() as db:
+        started = time.process_time()
+        items = loader(db)
+        load_seconds = time.process_time() - started
+        started = time.process_time()
+        body = render_json_list(ProductResponse, items)
+        render_seconds = time.process_time() - started
+        rows = len(items)
+    del items
+
+    # Memory run: peak while the rows are loaded
+    gc.collect()
+    with session_factory() as db:
+        tracemalloc.start()
+        items = loader(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    del items
+
+    return body, {
+        "rows": rows,
+        "load_us_per_row": round(load_seconds / rows * 1e6, 3),
+        "render_us_per_row": round(render_seconds / rows * 1e6, 3),
+        "total_us_per_row": round((load_seconds + render_seconds) / rows * 1e6, 3),
+        "peak_bytes_per_row": round(peak / rows, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--companies", type=int, default=100)
+    args = parser.parse_args()
+
+    from app.config import database
+    from app.config.schema import ensure_schema
+
+    database.engine.echo = False
+    ensure_schema(database.engine, database.Base.metadata)
+    seed(database.SessionLocal, args.companies, args.products, categories=10)
+
+    measure(database.SessionLocal, load_core)  # warm statement caches
+    orm_body, orm = measure(database.SessionLocal, load_orm)
+    core_body, core = measure(database.SessionLocal, load_core)
+    assert orm_body == core_body, "ORM and Core paths rendered different JSON"
+
+    print(json.dumps({
+        "products": args.products,
+        "identical_output": True,
+        "orm": orm,
+        "core": core,
+        "load_speedup": round(orm["load_us_per_row"] / core["load_us_per_row"], 2),
+        "memory_ratio": round(orm["peak_bytes_per_row"] / core["peak_bytes_per_row"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
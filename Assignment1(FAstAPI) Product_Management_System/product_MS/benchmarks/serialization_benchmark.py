@@ -0,0 +1,143 @@
+"""
+Serialization microbenchmark: default list response path vs FAST_JSON_RESPONSES.
+
+Timings cover only the response rendering for in-memory ORM objects:
+
+- default: what the running FastAPI does for response_model=List[Schema]:
+  validate from attributes, then pydantic-core's dump_json (recent FastAPI)
+  or dump to Python (mode="json") and JSONResponse's json.dumps (older)
+- fast:    app.utils.serialization.render_json_list
+
+Before timing, real /products/, /companies/ and /categories/ responses
+(TestClient, throwaway SQLite database) are fetched with the flag off and on
+and must be byte-identical, with product prices set to floats the two JSON
+writers format differently. Prints JSON:
+
+    python benchmarks/serialization_benchmark.py --items 100 --rounds 2000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import PROJECT_ROOT  # noqa: F401  (puts the app on sys.path)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+
+def make_items(count):
+    """Transient ORM objects shaped like a list page (products carry their company)"""
+    from app.models import Company, Product, Category
+
+    companies = [
+        Company(id=i + 1, name=f"Company {i}", description="Maker of things é",
+                website=f"https://company{i}.example.com")
+        for i in range(10)
+    ]
+    products = [
+        Product(id=i + 1, name=f"Product {i}", description=None if i % 3 else "benchmark product",
+                category=f"cat-{i % 7}", price=i % 500 + 0.99, company_id=companies[i % 10].id,
+                company=companies[i % 10])
+        for i in range(count)
+    ]
+    categories = [Category(id=i + 1, name=f"cat-{i}", description=f"Category {i}") for i in range(count)]
+    return {"products": products, "companies": (companies * (count // 10 + 1))[:count], "categories": categories}
+
+
+_default_adapters = {}
+
+
+def default_render(schema, items):
+    from typing import List
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from app.utils.serialization import fastapi_json_style
+
+    # FastAPI builds the response field's adapter once per route
+    if schema not in _default_adapters:
+        _default_adapters[schema] = TypeAdapter(List[schema])
+    adapter = _default_adapters[schema]
+    value = adapter.validate_python(items, from_attributes=True)
+    if fastapi_json_style() == "pydantic-core":
+        return adapter.dump_json(value)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+# Prices json.dumps and pydantic-core write differently ("5e-05" / "0.00005"), and ordinary ones
+EDGE_PRICES = (1e-07, 5e-05, 1e-05, 9.5e-05, 0.0001, 1e-09, 1e16, 0.30000000000000004, 12345678.9)
+
+
+def check_byte_identical():
+    """GET every list endpoint with FAST_JSON_RESPONSES off and on; the bodies must match"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.config.database import SessionLocal
+    from app.utils import serialization
+    from common import seed
+
+    with TestClient(app) as client:
+        seed(SessionLocal, companies=5, products=len(EDGE_PRICES) * 2, categories=4)
+        products = client.get("/products/?limit=100").json()
+        for product, price in zip(products, EDGE_PRICES):
+            # PUT keeps the price as sent (create rounds it to cents)
+            assert client.put(f"/products/{product['id']}", json={"price": price}).status_code == 200
+        for path in ("/products/?limit=100", "/companies/?limit=100", "/categories/?limit=100"):
+            bodies = {}
+            for flag in (False, True):
+                serialization.FAST_JSON_RESPONSES = flag
+                response = client.get(path)
+                assert response.status_code == 200, (path, response.text)
+                bodies[flag] = response.content
+            assert bodies[False] == bodies[True], (path, bodies)
+        serialization.FAST_JSON_RESPONSES = False
+
+
+def time_per_item(render, schema, items, rounds):
+    render(schema, items)  # warm-up (adapter construction)
+    started = time.process_time()
+    for _ in range(rounds):
+        render(schema, items)
+    return (time.process_time() - started) / (rounds * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="items per page")
+    parser.add_argument("--rounds", type=int, default=1000, help="pages rendered per measurement")
+    args = parser.parse_args()
+
+    from app.schemas.product import ProductResponse
+    from app.schemas.company import CompanyResponse
+    from app.schemas.category import CategoryResponse
+    from app.utils.serialization import fastapi_json_style, render_json_list
+
+    check_byte_identical()
+    data = make_items(args.items)
+    schemas = {"products": ProductResponse, "companies": CompanyResponse, "categories": CategoryResponse}
+
+    edge = make_items(len(EDGE_PRICES))["products"]
+    for product, price in zip(edge, EDGE_PRICES):
+        product.price = price
+    assert render_json_list(ProductResponse, edge) == default_render(ProductResponse, edge)
+
+    results = {}
+    for name, schema in schemas.items():
+        items = data[name]
+        assert render_json_list(schema, items) == default_render(schema, items), name
+        default_us = time_per_item(default_render, schema, items, args.rounds)
+        fast_us = time_per_item(render_json_list, schema, items, args.rounds)
+        results[name] = {
+            "default_us_per_item": round(default_us, 3),
+            "fast_us_per_item": round(fast_us, 3),
+            "saved_us_per_item": round(default_us - fast_us, 3),
+            "speedup": round(default_us / fast_us, 2),
+        }
+
+    print(json.dumps({"items_per_page": args.items, "rounds": args.rounds,
+                      "fastapi_json_style": fastapi_json_style(),
+                      "byte_identical": True, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
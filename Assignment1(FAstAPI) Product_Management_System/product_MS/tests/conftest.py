@@ -0,0 +1,32 @@
+"""Shared fixtures: the app on a throwaway SQLite database, seeded once per session."""
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Must be set before app.config.database is imported
+_DB_DIR = tempfile.mkdtemp(prefix="product-ms-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("DB_MODE", "sync")
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def catalog(client):
+    """Several companies, each with several products; returns the product ids"""
+    from app.config.database import SessionLocal
+    from benchmarks.common import seed
+    seed(SessionLocal, companies=5, products=40, categories=4)
+    return [item["id"] for item in client.get("/products/?limit=100").json()]
@@ -0,0 +1,74 @@
+"""
+The product read endpoints must run a constant number of SQL statements,
+however many products (and distinct companies) a page holds: no N+1 on
+Product.company.
+"""
+import pytest
+from sqlalchemy import event
+
+# Statements each endpoint may run per request
+MAX_QUERIES = {
+    "list": 1,
+    "search": 1,
+    "get": 1,
+}
+
+
+@pytest.fixture
+def statements():
+    """Collects every statement executed on the app's primary engine during the test"""
+    from app.config.settings import DB_MODE
+    if DB_MODE == "async":
+        from app.config.async_database import async_engine
+        engine = async_engine.sync_engine
+    else:
+        from app.config.database import engine
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(autouse=True)
+def cold_cache():
+    # GET-by-id must hit the database to be measured
+    from app.utils.cache import entity_cache
+    entity_cache.clear()
+
+
+@pytest.mark.parametrize("limit", [1, 10, 40])
+def test_list_products(client, catalog, statements, limit):
+    response = client.get(f"/products/?limit={limit}")
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    assert len({item["company"]["id"] for item in response.json()}) == min(limit, 5)
+    assert 0 < len(statements) <= MAX_QUERIES["list"], statements
+
+
+@pytest.mark.parametrize("params", ["limit=40", "q=product&limit=40", "min_price=10&max_price=400&limit=40"])
+def test_search_products(client, catalog, statements, params):
+    response = client.get(f"/products/search?{params}")
+    assert response.status_code == 200
+    assert len(response.json()) > 1
+    assert all(item["company"]["name"] for item in response.json())
+    assert 0 < len(statements) <= MAX_QUERIES["search"], statements
+
+
+def test_get_product(client, catalog, statements):
+    for product_id in catalog[:5]:
+        statements.clear()
+        response = client.get(f"/products/{product_id}")
+        assert response.status_code == 200
+        assert response.json()["company"]["id"] == response.json()["company_id"]
+        assert 0 < len(statements) <= MAX_QUERIES["get"], statements
+
+
+def test_get_product_cached(client, catalog, statements):
+    client.get(f"/products/{catalog[0]}")
+    statements.clear()
+    assert client.get(f"/products/{catalog[0]}").status_code == 200
+    assert statements == []
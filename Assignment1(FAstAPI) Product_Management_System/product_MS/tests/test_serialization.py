@@ -0,0 +1,49 @@
+"""
+FAST_JSON_RESPONSES must not change a single byte of the list responses,
+including floats json.dumps and pydantic-core write differently.
+"""
+import pytest
+
+# "5e-05" for json.dumps, "0.00005" for pydantic-core, and ordinary prices
+EDGE_PRICES = (1e-07, 5e-05, 1e-05, 9.5e-05, 0.0001, 1e16, 0.30000000000000004, 12345678.9)
+
+
+@pytest.fixture(scope="module")
+def edge_company(client):
+    """A company whose products carry EDGE_PRICES; returns its id"""
+    company = client.post("/companies/", json={"name": "Edge prices"}).json()
+    for index, price in enumerate(EDGE_PRICES):
+        product = client.post("/products/", json={
+            "name": f"Edge {index}", "category": "edge", "price": 1, "company_id": company["id"],
+        }).json()
+        # PUT keeps the price as sent (create rounds it to cents)
+        assert client.put(f"/products/{product['id']}", json={"price": price}).status_code == 200
+    return company["id"]
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    from app.utils import serialization
+
+    def switch(enabled):
+        monkeypatch.setattr(serialization, "FAST_JSON_RESPONSES", enabled)
+    return switch
+
+
+@pytest.mark.parametrize("path", [
+    "/products/search?company_id={company_id}&limit=100",
+    "/products/?limit=100",
+    "/companies/?limit=100",
+    "/categories/?limit=100",
+])
+def test_fast_json_is_byte_identical(client, catalog, edge_company, fast_json, path):
+    path = path.format(company_id=edge_company)
+    bodies = []
+    for enabled in (False, True):
+        fast_json(enabled)
+        response = client.get(path)
+        assert response.status_code == 200
+        bodies.append(response.content)
+    assert bodies[0] == bodies[1]
+    if "company_id" in path:
+        assert [item["price"] for item in response.json()] == list(EDGE_PRICES)
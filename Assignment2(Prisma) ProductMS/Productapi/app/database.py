@@ -1,7 +1,12 @@
 # app/database.py
+import hashlib
 import os
-from sqlalchemy import create_engine
+import time
+from collections import deque
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, delete, event, exc, insert, inspect, select, text
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,8 +17,129 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL not found in .env file")
 
+# Pool presets (same names and keys as product_MS); DB_POOL_* env vars override single values
+POOL_PROFILES = {
+    "default": {"pool_size": 5, "max_overflow": 10, "pool_recycle": -1, "pool_timeout": 30.0,
+                "pre_ping": "always", "pre_ping_idle_seconds": 30.0},
+    "web": {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800, "pool_timeout": 10.0,
+            "pre_ping": "idle", "pre_ping_idle_seconds": 30.0},
+    "worker": {"pool_size": 2, "max_overflow": 0, "pool_recycle": 3600, "pool_timeout": 60.0,
+               "pre_ping": "idle", "pre_ping_idle_seconds": 60.0},
+}
+
+PRE_PING_MODES = ("always", "idle", "never")
+
+
+def resolve_pool_config() -> dict:
+    """Profile preset with the DB_POOL_* / DB_PRE_PING* overrides applied; ValueError on unknown names"""
+    profile = os.getenv("DB_POOL_PROFILE", "default").lower()
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE '{profile}', use one of {list(POOL_PROFILES)}")
+    config = dict(POOL_PROFILES[profile], profile=profile)
+    for key, env, cast in (
+        ("pool_size", "DB_POOL_SIZE", int),
+        ("max_overflow", "DB_MAX_OVERFLOW", int),
+        ("pool_recycle", "DB_POOL_RECYCLE", int),
+        ("pool_timeout", "DB_POOL_TIMEOUT", float),
+        ("pre_ping", "DB_PRE_PING", str.lower),  # always | idle | never
+        ("pre_ping_idle_seconds", "DB_PRE_PING_IDLE_SECONDS", float),
+    ):
+        if os.getenv(env):
+            config[key] = cast(os.getenv(env))
+    if config["pre_ping"] not in PRE_PING_MODES:
+        raise ValueError(f"Unknown DB_PRE_PING '{config['pre_ping']}', use one of {list(PRE_PING_MODES)}")
+    return config
+
+
+POOL_CONFIG = resolve_pool_config()
+
+# Pool bookkeeping for /health/pool
+_checkout_waits = deque(maxlen=2048)
+_connected_at = {}
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout took. Pool.connect() is what
+    the engine calls per checkout; engine.dispose() recreates the pool with the
+    same class, so the timing survives it.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _checkout_waits.append(time.perf_counter() - started)
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_size=POOL_CONFIG["pool_size"],
+    max_overflow=POOL_CONFIG["max_overflow"],
+    pool_recycle=POOL_CONFIG["pool_recycle"],
+    pool_timeout=POOL_CONFIG["pool_timeout"],
+    pool_pre_ping=POOL_CONFIG["pre_ping"] == "always",
+)
+
+
+# Pool events are registered on the engine so they carry over to a recreated pool
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, record):
+    _connected_at[id(record)] = record.info["last_checkin"] = time.monotonic()
+
+
+@event.listens_for(engine, "close")
+def _on_close(dbapi_connection, record):
+    _connected_at.pop(id(record), None)
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, record):
+    if record is not None:
+        record.info["last_checkin"] = time.monotonic()
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, record, proxy):
+    # "idle" pre-ping: only connections unused for a while get the extra round-trip
+    if POOL_CONFIG["pre_ping"] != "idle":
+        return
+    if time.monotonic() - record.info.get("last_checkin", 0.0) < POOL_CONFIG["pre_ping_idle_seconds"]:
+        return
+    try:
+        alive = engine.dialect.do_ping(dbapi_connection)
+    except Exception:
+        alive = False
+    if not alive:
+        raise exc.DisconnectionError("Connection failed idle pre-ping")
+
+
+def pool_stats():
+    """Live occupancy, checkout wait percentiles (ms) and connection ages (s)"""
+    pool = engine.pool
+    waits = sorted(_checkout_waits)
+    now = time.monotonic()
+    ages = sorted(now - created for created in list(_connected_at.values()))
+
+    def pct(p):
+        return round(waits[min(len(waits) - 1, int(p / 100 * len(waits)))] * 1000, 3) if waits else None
+
+    return {
+        "config": POOL_CONFIG,
+        "size": pool.size() if hasattr(pool, "size") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        "checkout_wait_ms": {"samples": len(waits), "p50": pct(50), "p95": pct(95), "p99": pct(99)},
+        "connection_age_seconds": {
+            "open": len(ages),
+            "min": round(ages[0], 1) if ages else None,
+            "max": round(ages[-1], 1) if ages else None,
+        },
+    }
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,6 +147,42 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+
+# Stored hash of the models' DDL; startup only runs create_all when it changes
+schema_metadata = MetaData()
+schema_fingerprint_table = Table(
+    "schema_fingerprint",
+    schema_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda ix: ix.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def ensure_schema() -> bool:
+    """Create tables if the models changed since the last start; True if it did"""
+    fingerprint = schema_fingerprint()
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Workers starting together wait here instead of racing create_all
+            conn.execute(text("SELECT pg_advisory_xact_lock(7310425)"))
+        if inspect(conn).has_table("schema_fingerprint"):
+            if conn.execute(select(schema_fingerprint_table.c.fingerprint)).scalar() == fingerprint:
+                return False
+        Base.metadata.create_all(conn)
+        schema_metadata.create_all(conn)
+        conn.execute(delete(schema_fingerprint_table))
+        conn.execute(insert(schema_fingerprint_table).values(id=1, fingerprint=fingerprint))
+    return True
+
 # Dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
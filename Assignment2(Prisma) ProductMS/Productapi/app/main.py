@@ -1,16 +1,43 @@
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.database import Base, engine
+from sqlalchemy import text
+from app.database import engine, ensure_schema, pool_stats
 #from app.models import company, category, product
 from app.routers import company_routers,category_routers,product_routers
-# Create tables
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+startup_times = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables are checked here, once per worker, instead of at import time
+    started = time.perf_counter()
+    startup_times["schema_changed"] = ensure_schema()
+    with engine.connect() as conn:  # open the first pool connection before serving
+        conn.execute(text("SELECT 1"))
+    startup_times["startup_seconds"] = round(time.perf_counter() - started, 4)
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def root():
     return {"message": "Welcome to Product Management API!"}
+
+@app.get("/health/startup")
+def startup_report():
+    """Import and startup time of this worker"""
+    return startup_times
+
+@app.get("/health/pool")
+def pool_health():
+    """Pool occupancy, checkout wait percentiles and connection ages"""
+    return pool_stats()
 app.include_router(company_routers.router)
 app.include_router(category_routers.router) 
 print("hello")
-#app.include_router(product_routers.router)
\ No newline at end of file
+#app.include_router(product_routers.router)
+
+startup_times["import_seconds"] = round(time.perf_counter() - _import_started, 4)
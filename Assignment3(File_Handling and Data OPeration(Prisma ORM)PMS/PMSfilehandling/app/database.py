@@ -0,0 +1,74 @@
+# app/database.py
+import hashlib
+import os
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, delete, insert, inspect, select, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.orm import sessionmaker, declarative_base
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Falls back to the local SQLite file shipped with the project
+DATABASE_URL = os.getenv("DATABASE_URL") or "sqlite:///./test.db"
+
+# SQLite connections are used from FastAPI's threadpool, so allow cross-thread use.
+# Parallel import jobs serialize on SQLite's write lock; wait for it instead of failing.
+connect_args = {"check_same_thread": False, "timeout": 60} if DATABASE_URL.startswith("sqlite") else {}
+
+# Create SQLAlchemy engine
+engine = create_engine(DATABASE_URL, connect_args=connect_args)
+
+# Create SessionLocal class for database sessions
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Base class for models
+Base = declarative_base()
+
+
+# Stored hash of the models' DDL; startup only runs create_all when it changes
+schema_metadata = MetaData()
+schema_fingerprint_table = Table(
+    "schema_fingerprint",
+    schema_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda ix: ix.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def ensure_schema() -> bool:
+    """Create tables if the models changed since the last start; True if it did"""
+    fingerprint = schema_fingerprint()
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Workers starting together wait here instead of racing create_all
+            conn.execute(text("SELECT pg_advisory_xact_lock(7310425)"))
+        if inspect(conn).has_table("schema_fingerprint"):
+            if conn.execute(select(schema_fingerprint_table.c.fingerprint)).scalar() == fingerprint:
+                return False
+        Base.metadata.create_all(conn)
+        # create_all skips tables that already exist, including their new indexes
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        schema_metadata.create_all(conn)
+        conn.execute(delete(schema_fingerprint_table))
+        conn.execute(insert(schema_fingerprint_table).values(id=1, fingerprint=fingerprint))
+    return True
+
+# Dependency for FastAPI routes
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
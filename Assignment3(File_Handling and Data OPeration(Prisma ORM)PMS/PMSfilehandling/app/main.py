@@ -1,8 +1,34 @@
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from sqlalchemy import text
 from app.routers import file_router
-from app.database import engine, Base
+from app.database import engine, ensure_schema
+from app.utils.jobs import import_jobs
+
+startup_times = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables are checked here, once per worker, instead of at import time
+    started = time.perf_counter()
+    startup_times["schema_changed"] = ensure_schema()
+    with engine.connect() as conn:  # open the first pool connection before serving
+        conn.execute(text("SELECT 1"))
+    startup_times["startup_seconds"] = round(time.perf_counter() - started, 4)
+    yield
+    # Queued imports are dropped; their spool files stay in IMPORT_SPOOL_DIR
+    import_jobs.shutdown()
 
-app = FastAPI(title="Product File Handling API")
+app = FastAPI(title="Product File Handling API", lifespan=lifespan)
 
-Base.metadata.create_all(bind=engine)
 app.include_router(file_router.router)
+
+@app.get("/health/startup")
+def startup_report():
+    """Import and startup time of this worker"""
+    return startup_times
+
+startup_times["import_seconds"] = round(time.perf_counter() - _import_started, 4)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String
-import Base
+from sqlalchemy import Column, Index, Integer, String
+from app.database import Base
 
 class Product(Base):
     __tablename__ = "products"
@@ -8,3 +8,6 @@ class Product(Base):
     category = Column(String, nullable=False)
     price = Column(Integer, nullable=False)
     company = Column(String, nullable=False)
+
+    # Natural key used by upsert imports
+    __table_args__ = (Index("ix_products_name_company", "name", "company"),)
@@ -0,0 +1,8 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+from app.database import Base
+
+class ProductRowHash(Base):
+    """Content hash of the imported (non-key) columns of a product, written by upsert imports"""
+    __tablename__ = "product_row_hashes"
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    row_hash = Column(BigInteger, nullable=False)
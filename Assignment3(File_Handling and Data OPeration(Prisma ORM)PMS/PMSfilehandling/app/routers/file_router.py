@@ -1,22 +1,68 @@
-from fastapi import APIRouter, UploadFile, File, Depends, Query
+from typing import Literal
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from app.database import get_db
 from app.models.product import Product
 from app.schemas.product_schema import ProductCreate
-from app.utils.file_utils import read_csv_to_dicts, export_to_csv
+from app.utils.file_utils import stream_csv, stream_ndjson, stream_arrow, stream_parquet, DEFAULT_CHUNK_SIZE
+from app.utils.jobs import import_jobs
+from app.utils.export_utils import iter_product_batches, export_arrow_schema, EXPORT_COLUMNS, COLUMNAR_CHUNK_SIZE
 
 router = APIRouter(prefix="/file", tags=["File Handling"])
 
-# 1️⃣ Upload CSV and insert into DB
-@router.post("/upload")
-async def upload_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    data = read_csv_to_dicts(file)
-    for record in data:
-        product = Product(**record)
-        db.add(product)
-    db.commit()
-    return {"message": f"{len(data)} records inserted successfully!"}
+# format -> (media type, file extension)
+DOWNLOAD_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# 1️⃣ Upload CSV: spooled to disk and imported by a background worker (parsed and bulk-inserted chunk by chunk)
+@router.post("/upload", status_code=202)
+def upload_csv(
+    response: Response,
+    file: UploadFile = File(...),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=100000),
+    mode: Literal["append", "upsert"] = Query("append", description="upsert: match on name + company, write only new or changed rows"),
+    wait: bool = Query(False, description="Block until the import finishes and return its result")
+):
+    job, future = import_jobs.submit(file.file, file.filename, chunk_size, mode)
+    if wait:
+        future.result()
+        if job.status == "failed":
+            raise HTTPException(status_code=400, detail=job.errors)
+        response.status_code = 200
+        stats = job.result
+        return {
+            "message": f"{stats['inserted']} records inserted successfully!",
+            "job_id": job.id,
+            **stats,
+            "errors_url": job.to_dict()["errors_url"],
+        }
+    return {"job_id": job.id, "status": job.status, "status_url": f"{router.prefix}/jobs/{job.id}"}
+
+# Progress of one import: rows processed, rows/sec, errors
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+# Rows an import rejected, as CSV: row number, reasons, original values
+@router.get("/jobs/{job_id}/errors")
+def get_job_errors(job_id: str):
+    job = import_jobs.get(job_id)
+    if job is None or job.errors_path is None:
+        raise HTTPException(status_code=404, detail="No rejected rows for this job")
+    return FileResponse(job.errors_path, media_type="text/csv", filename=f"{job.id}-errors.csv")
+
+# Recent imports, newest first
+@router.get("/jobs")
+def list_jobs():
+    return [job.to_dict() for job in import_jobs.list()]
 
 # 2️⃣ Add single product via JSON
 @router.post("/add")
@@ -27,31 +73,23 @@ async def add_product(product: ProductCreate, db: Session = Depends(get_db)):
     db.refresh(new_product)
     return new_product
 
-# 3️⃣ Download all or limited rows as CSV
+# 3️⃣ Download all or limited rows (streamed batch by batch from a server-side cursor)
+#    as CSV, NDJSON, an Arrow IPC stream or Parquet
 @router.get("/download")
 def download_data(
-    db: Session = Depends(get_db),
-    limit: int | None = Query(None)
+    limit: int | None = Query(None),
+    format: Literal["csv", "ndjson", "arrow", "parquet"] = Query("csv")
 ):
-    query = db.query(Product)
-    if limit:
-        query = query.limit(limit)
-    products = query.all()
-
-    data = [
-        {
-            "id": p.id,
-            "name": p.name,
-            "category": p.category,
-            "price": p.price,
-            "company": p.company,
-        }
-        for p in products
-    ]
-
-    csv_stream = export_to_csv(data)
+    if format == "csv":
+        stream = stream_csv(EXPORT_COLUMNS, iter_product_batches(limit))
+    elif format == "ndjson":
+        stream = stream_ndjson(EXPORT_COLUMNS, iter_product_batches(limit))
+    else:
+        writer = stream_arrow if format == "arrow" else stream_parquet
+        stream = writer(export_arrow_schema(), iter_product_batches(limit, COLUMNAR_CHUNK_SIZE))
+    media_type, extension = DOWNLOAD_FORMATS[format]
     return StreamingResponse(
-        csv_stream,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=products.csv"}
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=products.{extension}"}
     )
@@ -0,0 +1,38 @@
+from sqlalchemy import Integer, select
+from app.database import engine
+from app.models.product import Product
+
+# Rows fetched from the server-side cursor per batch
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows per batch for Arrow/Parquet: each batch becomes one record batch / row group,
+# and larger ones compress and scan better
+COLUMNAR_CHUNK_SIZE = 20000
+
+EXPORT_COLUMNS = ["id", "name", "category", "price", "company"]
+
+def export_arrow_schema():
+    """Arrow schema of the exported columns, taken from the model's column types."""
+    import pyarrow as pa  # only needed for columnar downloads
+    table = Product.__table__
+    return pa.schema([
+        pa.field(name, pa.int64() if isinstance(table.c[name].type, Integer) else pa.string(), nullable=table.c[name].nullable)
+        for name in EXPORT_COLUMNS
+    ])
+
+def iter_product_batches(limit=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields product rows in batches read from a server-side cursor.
+    Plain Core select on a connection of its own: no Session, no ORM
+    compile step, and it stays open for the whole streaming response,
+    independent of the request.
+    """
+    table = Product.__table__
+    stmt = select(*(table.c[name] for name in EXPORT_COLUMNS)).order_by(table.c.id)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+        for partition in result.partitions():
+            yield partition
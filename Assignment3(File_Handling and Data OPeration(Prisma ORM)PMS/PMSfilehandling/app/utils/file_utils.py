@@ -1,16 +1,84 @@
+import csv
+import json
 import pandas as pd
 from io import StringIO
 
-def read_csv_to_dicts(file):
-    """Reads uploaded CSV file and returns list of dict records."""
-    content = file.file.read().decode('utf-8')
-    df = pd.read_csv(StringIO(content))
-    return df.to_dict(orient='records')
+# Rows parsed and written per batch when streaming an upload
+DEFAULT_CHUNK_SIZE = 5000
 
-def export_to_csv(data):
-    """Converts list of dicts into a CSV stream (for download)."""
-    df = pd.DataFrame(data)
+def iter_csv_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parses a CSV file object in fixed-size chunks, yielding one DataFrame per chunk.
+    Every column is read as text (only empty fields become NaN) so validation
+    decides how values are coerced, not pandas' type inference.
+    """
+    source.seek(0)
+    for chunk in pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=[""]):
+        yield chunk
+
+def stream_csv(columns, batches):
+    """Encodes batches of row tuples as CSV, yielding bytes as each batch is written."""
     output = StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    return output
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield output.getvalue().encode("utf-8")
+        output.seek(0)
+        output.truncate(0)
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+def stream_ndjson(columns, batches):
+    """Encodes batches of row tuples as newline-delimited JSON objects, one line per row."""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for rows in batches:
+        yield "".join(encode(dict(zip(columns, row))) + "\n" for row in rows).encode("utf-8")
+
+class _ChunkSink:
+    """Write-only file object for pyarrow writers; each drain() hands back what was written since the last one."""
+
+    def __init__(self):
+        self._parts = []
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+def _record_batch(schema, rows):
+    import pyarrow as pa
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch([pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+def stream_arrow(schema, batches, compression="zstd"):
+    """Writes batches of row tuples as an Arrow IPC stream, yielding each record batch as soon as it is encoded."""
+    import pyarrow as pa
+    sink = _ChunkSink()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, schema, options=options) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(schema, rows))
+            yield sink.drain()
+    yield sink.drain()
+
+def stream_parquet(schema, batches, compression="zstd"):
+    """Writes batches of row tuples as a Parquet file, one row group per batch; the footer comes last."""
+    import pyarrow.parquet as pq
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(schema, rows))
+            yield sink.drain()
+    yield sink.drain()
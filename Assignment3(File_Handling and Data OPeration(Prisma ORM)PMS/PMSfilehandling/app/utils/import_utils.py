@@ -0,0 +1,178 @@
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import false, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.product import Product
+from app.models.product_row_hash import ProductRowHash
+from app.utils.file_utils import iter_csv_chunks, DEFAULT_CHUNK_SIZE
+from app.utils.validation_utils import ChunkValidator
+
+def insert_batch(db, records):
+    """Writes one batch of product dicts with a single executemany INSERT."""
+    if records:
+        db.execute(insert(Product), records)
+
+# Columns whose content hash decides whether an existing product changed
+# (name + company are the key, so they always match)
+HASHED_COLUMNS = ["category", "price"]
+
+# Keys per lookup query, well under SQLite's bound-parameter limit
+KEY_LOOKUP_SLICE = 500
+
+# Advisory lock held by an upsert import until it commits (PostgreSQL)
+UPSERT_LOCK_KEY = 7310426
+
+def row_hashes(valid):
+    """64-bit content hash per row of a validated chunk (signed, to fit BIGINT)."""
+    return pd.util.hash_pandas_object(valid[HASHED_COLUMNS], index=False).to_numpy().view(np.int64)
+
+def _existing_products(db, keys):
+    """{(name, company): (product_id, row_hash or None)}; the oldest product wins if a key repeats."""
+    wanted = set(keys)
+    names = sorted({name for name, _ in keys})
+    existing = {}
+    for start in range(0, len(names), KEY_LOOKUP_SLICE):
+        # A plain IN on the leading index column is an index probe on both
+        # SQLite and PostgreSQL; (name, company) row-value IN lists are not.
+        rows = db.execute(
+            select(Product.id, Product.name, Product.company, ProductRowHash.row_hash)
+            .outerjoin(ProductRowHash, ProductRowHash.product_id == Product.id)
+            .where(Product.name.in_(names[start:start + KEY_LOOKUP_SLICE]))
+        )
+        for product_id, name, company, row_hash in rows:
+            key = (name, company)
+            if key in wanted and (key not in existing or product_id < existing[key][0]):
+                existing[key] = (product_id, row_hash)
+    return existing
+
+def lock_upserts(db):
+    """
+    Serializes upsert imports for the rest of the caller's transaction.
+    name + company is not a unique key (append imports may repeat it), so two
+    upserts of overlapping files could otherwise both miss a key and insert
+    it twice. The lock is taken before the first lookup and released at
+    commit or rollback; append imports do not take it.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": UPSERT_LOCK_KEY})
+    elif dialect == "sqlite":
+        # A no-op write opens the transaction with SQLite's database write lock
+        db.execute(update(ProductRowHash).where(false()).values(row_hash=0))
+    else:
+        raise ValueError(f"Upsert imports are not supported on {dialect}")
+
+def _save_row_hashes(db, hash_rows):
+    """INSERT ... ON CONFLICT (product_id) DO UPDATE for the stored content hashes."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(ProductRowHash.__table__)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(ProductRowHash.__table__)
+    else:
+        raise ValueError(f"Upsert imports are not supported on {dialect}")
+    stmt = stmt.on_conflict_do_update(index_elements=["product_id"], set_={"row_hash": stmt.excluded.row_hash})
+    db.execute(stmt, hash_rows)
+
+def upsert_batch(db, valid):
+    """
+    Writes a validated chunk keyed on name + company (call lock_upserts first).
+    Rows whose content hash matches the stored one are skipped without a write;
+    changed rows are updated by primary key and new rows inserted. Returns
+    (inserted, updated, unchanged).
+    """
+    if valid.empty:
+        return 0, 0, 0
+    keys = list(zip(valid["name"].tolist(), valid["company"].tolist()))
+    hashes = row_hashes(valid).tolist()
+    existing = _existing_products(db, keys)
+
+    new, new_hashes, changed, hash_rows = [], [], [], []
+    for record, key, row_hash in zip(valid.to_dict(orient='records'), keys, hashes):
+        found = existing.get(key)
+        if found is None:
+            new.append(record)
+            new_hashes.append(row_hash)
+        elif found[1] != row_hash:
+            changed.append({"id": found[0], "category": record["category"], "price": record["price"]})
+            hash_rows.append({"product_id": found[0], "row_hash": row_hash})
+
+    if changed:
+        db.execute(update(Product), changed)
+    if new:
+        ids = db.scalars(insert(Product).returning(Product.id, sort_by_parameter_order=True), new).all()
+        hash_rows.extend({"product_id": product_id, "row_hash": row_hash} for product_id, row_hash in zip(ids, new_hashes))
+    if hash_rows:
+        _save_row_hashes(db, hash_rows)
+    return len(new), len(changed), len(valid) - len(new) - len(changed)
+
+def ingest_csv(source, db, chunk_size=DEFAULT_CHUNK_SIZE, on_batch=None, rejects=None, mode="append"):
+    """
+    Streams a CSV file object into the products table.
+    Only one chunk is held in memory at a time; each chunk is validated with
+    column operations, its valid rows are written as a bulk insert and the
+    whole import is committed once at the end.
+    mode="upsert" matches rows to existing products by name + company and only
+    writes new or changed ones (see upsert_batch); "append" inserts every row.
+    Rejected rows are appended to `rejects` (a text file object) as CSV with
+    their row number and reasons.
+    on_batch(rows, batches, bytes_read, rejected) is called after every chunk
+    so a background job can report progress.
+    Returns row/batch counts, throughput and the parse/validate split.
+    """
+    started = time.perf_counter()
+    validator = ChunkValidator()
+    rows = 0
+    inserted = 0
+    updated = 0
+    unchanged = 0
+    rejected = 0
+    batches = 0
+    parse_seconds = 0.0
+    validate_seconds = 0.0
+    if mode == "upsert":
+        lock_upserts(db)
+    chunks = iter_csv_chunks(source, chunk_size)
+    while True:
+        mark = time.perf_counter()
+        chunk = next(chunks, None)
+        parse_seconds += time.perf_counter() - mark
+        if chunk is None:
+            break
+
+        mark = time.perf_counter()
+        valid, bad = validator.validate(chunk)
+        validate_seconds += time.perf_counter() - mark
+
+        if mode == "upsert":
+            counts = upsert_batch(db, valid)
+            inserted += counts[0]
+            updated += counts[1]
+            unchanged += counts[2]
+        else:
+            insert_batch(db, valid.to_dict(orient='records'))
+            inserted += len(valid)
+        if len(bad) and rejects is not None:
+            bad.to_csv(rejects, header=rejected == 0, index=False)
+        rows += len(chunk)
+        rejected += len(bad)
+        batches += 1
+        if on_batch is not None:
+            on_batch(rows, batches, source.tell(), rejected)
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "mode": mode,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": unchanged,
+        "rejected": rejected,
+        "batches": batches,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else float(rows),
+        "parse_seconds": round(parse_seconds, 3),
+        "validate_seconds": round(validate_seconds, 3),
+    }
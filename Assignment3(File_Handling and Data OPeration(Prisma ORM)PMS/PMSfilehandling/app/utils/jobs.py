@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from app.database import SessionLocal
+from app.utils.import_utils import ingest_csv
+
+# Imports running at the same time (each has its own thread and DB session)
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "4"))
+# Uploads are copied here before the request returns; removed once imported
+IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR") or tempfile.gettempdir()
+# Finished jobs kept for /file/jobs lookups
+IMPORT_JOB_HISTORY = int(os.getenv("IMPORT_JOB_HISTORY", "200"))
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ImportJob:
+    """State of one CSV import, updated by the worker thread after every batch"""
+
+    def __init__(self, filename, path, chunk_size, mode):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.path = path
+        self.chunk_size = chunk_size
+        self.mode = mode
+        self.status = "queued"
+        self.bytes_total = os.path.getsize(path)
+        self.bytes_read = 0
+        self.rows = 0
+        self.rejected = 0
+        self.batches = 0
+        # CSV of rejected rows, kept until the job leaves the history
+        self.errors_path = None
+        self.errors = []
+        self.result = None
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self._started = None
+        self._finished = None
+
+    def progress(self, rows, batches, bytes_read, rejected):
+        self.rows, self.batches, self.bytes_read, self.rejected = rows, batches, bytes_read, rejected
+
+    def to_dict(self):
+        elapsed = None
+        if self._started is not None:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "mode": self.mode,
+            "progress": round(self.bytes_read / self.bytes_total, 4) if self.bytes_total else 1.0,
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "seconds": round(elapsed, 3) if elapsed is not None else None,
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else None,
+            "errors": self.errors,
+            "errors_url": f"/file/jobs/{self.id}/errors" if self.errors_path else None,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ImportJobs:
+    """
+    Runs spooled CSV imports on a thread pool so the request loop never
+    parses or writes. Parsing (pandas) and the DB drivers release the GIL for
+    most of the work, so several files import in parallel.
+    """
+
+    def __init__(self, workers=IMPORT_WORKERS, history=IMPORT_JOB_HISTORY):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="csv-import")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._history = history
+
+    def spool(self, fileobj) -> str:
+        """Copy an upload to the spool directory (the request's temp file dies with the request)"""
+        fd, path = tempfile.mkstemp(prefix="import-", suffix=".csv", dir=IMPORT_SPOOL_DIR)
+        with os.fdopen(fd, "wb") as out:
+            shutil.copyfileobj(fileobj, out, length=1024 * 1024)
+        return path
+
+    def submit(self, fileobj, filename, chunk_size, mode="append"):
+        job = ImportJob(filename, self.spool(fileobj), chunk_size, mode)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        future = self._executor.submit(self._run, job)
+        return job, future
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())[::-1]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("completed", "failed")]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            job = self._jobs.pop(job_id)
+            if job.errors_path:
+                os.remove(job.errors_path)
+
+    def _run(self, job):
+        job.status = "running"
+        job.started_at = _now()
+        job._started = time.perf_counter()
+        db = SessionLocal()
+        errors_path = os.path.join(IMPORT_SPOOL_DIR, f"import-{job.id}-errors.csv")
+        try:
+            with open(job.path, "rb") as source, open(errors_path, "w", newline="", encoding="utf-8") as rejects:
+                job.result = ingest_csv(source, db, job.chunk_size, on_batch=job.progress, rejects=rejects, mode=job.mode)
+            job.status = "completed"
+        except Exception as e:
+            db.rollback()
+            job.errors.append(f"{type(e).__name__}: {e}")
+            job.status = "failed"
+        finally:
+            db.close()
+            job._finished = time.perf_counter()
+            job.finished_at = _now()
+            os.remove(job.path)
+            if os.path.exists(errors_path) and os.path.getsize(errors_path):
+                job.errors_path = errors_path
+            elif os.path.exists(errors_path):
+                os.remove(errors_path)
+        return job
+
+
+import_jobs = ImportJobs()
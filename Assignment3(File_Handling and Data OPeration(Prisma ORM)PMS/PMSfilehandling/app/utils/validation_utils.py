@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Columns an uploaded CSV must have; anything else in the file is ignored
+REQUIRED_COLUMNS = ["name", "category", "price", "company"]
+TEXT_COLUMNS = ["name", "category", "company"]
+
+# Longest accepted value per text column
+MAX_LENGTHS = {"name": 255, "category": 100, "company": 255}
+
+# Products.price is a 32-bit INTEGER on PostgreSQL
+MAX_PRICE = 2**31 - 1
+
+# A product is a duplicate if this key already appeared earlier in the same upload
+DUPLICATE_KEY = ["name", "company"]
+
+class ChunkValidator:
+    """
+    Validates parsed CSV chunks with column operations instead of per-row model
+    construction. One instance per upload: it remembers the keys seen in earlier
+    chunks so duplicates are caught across the whole file.
+    """
+
+    def __init__(self):
+        self._seen = _SortedKeys()
+
+    def check_columns(self, df):
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    def validate(self, df):
+        """
+        Splits a chunk of string columns into (valid, rejected).
+        valid has the model's columns with price as int64; rejected has the
+        1-based data row number, the reasons and the original values.
+        Checks build boolean masks over whole columns; reason strings are only
+        assembled for the rows that failed.
+        """
+        self.check_columns(df)
+        # Arrow arrays: the string kernels run in C over the whole column (no copy for pyarrow-backed strings)
+        columns = {column: pa.array(df[column], from_pandas=True) for column in REQUIRED_COLUMNS}
+        checks = []
+
+        for column in TEXT_COLUMNS:
+            values = columns[column]
+            length = pc.utf8_length(values)
+            blank = pc.or_(pc.equal(length, 0), pc.utf8_is_space(values))
+            checks.append((f"{column} is required", _mask(blank, True)))
+            too_long = pc.greater(length, MAX_LENGTHS[column])
+            checks.append((f"{column} longer than {MAX_LENGTHS[column]}", _mask(too_long, False)))
+
+        price = _coerce_price(columns["price"])
+        bad_price = np.isnan(price) | (price != np.round(price))
+        checks.append(("price is not an integer", bad_price))
+        checks.append(("price out of range", ~bad_price & (np.abs(price) > MAX_PRICE)))
+
+        # Among otherwise valid rows the first occurrence of a key wins
+        failed = np.logical_or.reduce([mask for _, mask in checks])
+        candidates = np.flatnonzero(~failed)
+        keys = _key_hashes(columns, candidates)
+        repeated = self._seen.contains(keys)
+        repeated |= pd.Index(keys).duplicated()
+        duplicate = np.zeros(len(df), dtype=bool)
+        duplicate[candidates[repeated]] = True
+        checks.append(("duplicate name+company", duplicate))
+        self._seen.add(keys[~repeated])
+
+        failed |= duplicate
+        # Built from the column arrays: cheaper than masking and assigning on the frame
+        keep = ~failed
+        valid = pd.DataFrame(
+            {column: price[keep].astype("int64") if column == "price" else df[column].array[keep] for column in REQUIRED_COLUMNS},
+            index=df.index[keep], copy=False,
+        )
+        reasons = [[message for message, mask in checks if mask[i]] for i in np.flatnonzero(failed)]
+        index = df.index[failed]
+        rejected = pd.DataFrame(
+            {"row": index.to_numpy() + 1, **{column: df[column].array[failed] for column in REQUIRED_COLUMNS},
+             "error": ["; ".join(messages) for messages in reasons]},
+            index=index, copy=False,
+        )
+        return valid, rejected
+
+class _SortedKeys:
+    """
+    Set of uint64 keys held as sorted NumPy runs. A new run is merged into the
+    previous ones while it is at least as large (like a binary counter), so
+    there are O(log n) runs and each key is re-sorted O(log n) times over the
+    whole upload. A bitmap over the top bits of the keys (they are hashes, so
+    spread evenly) answers most lookups of new keys without searching the runs.
+    """
+
+    BUCKET_BITS = 22  # 4 MB bitmap; with millions of keys most lookups fall through to the runs
+
+    def __init__(self):
+        self._runs = []
+        self._buckets = np.zeros(1 << self.BUCKET_BITS, dtype=bool)
+
+    def _bucket(self, keys):
+        return keys >> np.uint64(64 - self.BUCKET_BITS)
+
+    def contains(self, keys):
+        found = np.zeros(len(keys), dtype=bool)
+        maybe = np.flatnonzero(self._buckets[self._bucket(keys)])
+        # Sorted needles keep the binary searches cache-friendly
+        maybe = maybe[np.argsort(keys[maybe])]
+        needles = keys[maybe]
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, needles), len(run) - 1)
+            found[maybe] |= run[positions] == needles
+        return found
+
+    def add(self, keys):
+        """Adds keys that are not in the set yet (and are unique among themselves)"""
+        self._buckets[self._bucket(keys)] = True
+        run = np.sort(keys)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind="stable")
+        if len(run):
+            self._runs.append(run)
+
+def _mask(condition, null_value):
+    """Arrow boolean array as a NumPy mask; nulls (missing values) become null_value"""
+    return pc.fill_null(condition, null_value).to_numpy(zero_copy_only=False)
+
+def _coerce_price(values):
+    """Price strings (an Arrow array) as float64, NaN where not numeric; integers take the fast path."""
+    if not values.null_count:
+        try:
+            return pc.cast(values, pa.int64()).to_numpy().astype(np.float64)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    price = pd.to_numeric(values.to_numpy(zero_copy_only=False), errors="coerce").astype(np.float64)
+    price[~np.isfinite(price)] = np.nan
+    return price
+
+def _key_hashes(columns, rows):
+    """64-bit hash of the duplicate key for the given row positions (columns: name -> Arrow array)."""
+    combined = np.zeros(len(rows), dtype=np.uint64)
+    for column in DUPLICATE_KEY:
+        # As bytes objects: same hashes as the str values, without encoding each one to UTF-8 again
+        values = columns[column]
+        if len(rows) < len(values):
+            values = values.take(rows)
+        values = values.cast(pa.large_binary()).to_numpy(zero_copy_only=False)
+        combined = combined * np.uint64(1000003) ^ pd.util.hash_array(values, categorize=False)
+    return combined